@@ -0,0 +1,204 @@
+import copy
+from civsSimulator.Game import Game
+from civsSimulator.Map import Map
+from civsSimulator.Trade import TradeGraph
+from civsSimulator.Generator import get_generator
+from civsSimulator import Events, Worlds
+from civsSimulator.Benchmarks import Runner
+
+SEED = 42709
+
+
+class Case:
+    """This class represents a benchmark case.
+
+    :param name: The name of the benchmark, like **turn**.
+    :param params: A dictionary with the parameters of the case.
+    :param setup: A function with no arguments that prepares the case and returns the function to time. It is called
+                  before every repetition, and its time is not measured.
+    :param number: The number of operations done by the timed function, used to report the time per operation.
+    """
+    def __init__(self, name, params, setup, number=1):
+        self.name = name
+        self.params = params
+        self.setup = setup
+        self.number = number
+
+    @property
+    def key(self):
+        """
+        The name of the case with its parameters, like **turn[groups=100,size=256]**.
+        """
+        return "{}[{}]".format(self.name, ",".join("{}={}".format(k, self.params[k]) for k in sorted(self.params)))
+
+
+_worlds = {}
+
+
+def world(size):
+    """
+    A square world of the given size generated with :func:`Worlds.generate`, cached for every size.
+
+    :param size: The width and height of the world.
+    :return: A :class:`Map.Map`.
+    """
+    if size not in _worlds:
+        _worlds[size] = Map(Worlds.generate(size, size, SEED))
+    return _worlds[size]
+
+
+def configure(config, population=1, radius=None):
+    """
+    A copy of the configuration with scaled parameters.
+
+    :param config: The configuration of the tribes.
+    :param population: The factor applied to the **Max-initial-population** of every tribe.
+    :param radius: If not None, the **Migration-radius** of every culture and the **Trade-base-radius**.
+    :return: The new configuration.
+    """
+    config = copy.deepcopy(config)
+    tribes = [config["Tribe"]["General"]] + config["Tribe"]["Tribes"]
+    for tribe in tribes:
+        if "Max-initial-population" in tribe:
+            for cohort, value in tribe["Max-initial-population"].items():
+                tribe["Max-initial-population"][cohort] = max(int(value * population), 1)
+        if radius is not None:
+            if "Migration-radius" in tribe:
+                for culture in tribe["Migration-radius"]:
+                    tribe["Migration-radius"][culture] = radius
+            if "Trade-base-radius" in tribe:
+                tribe["Trade-base-radius"] = radius
+    return config
+
+
+def game(config, groups, size=256, population=1, radius=None, turns=0, vectorized=False):
+    """
+    Creates a seeded game for a benchmark.
+
+    :param config: The configuration of the tribes.
+    :param groups: The number of groups.
+    :param size: The size of the world.
+    :param population: The factor applied to the initial population.
+    :param radius: The migration and trade radius, or None to keep the configured ones.
+    :param turns: The number of turns simulated before returning the game.
+    :param vectorized: If True the game uses the vectorized population.
+    :return: The game.
+    """
+    g = Game(configure(config, population, radius), world(size), vectorized, seed=SEED)
+    g.create_groups(groups)
+    for _ in range(turns):
+        g.turn()
+    return g
+
+
+def _create_group(config, groups, size):
+    def setup():
+        g = Game(config, world(size), seed=SEED)
+
+        def run():
+            for _ in range(groups):
+                g.create_group()
+        return run
+    return setup
+
+
+def _turn(config, groups, size, population, radius, vectorized, turns=5):
+    def setup():
+        g = game(config, groups, size, population, radius, vectorized=vectorized)
+
+        def run():
+            for _ in range(turns):
+                g.turn()
+        return run
+    return setup
+
+
+def _event(config, event, groups, radius, knows_trade=False):
+    def setup():
+        g = game(config, groups, radius=radius, turns=5)
+        information = g.information()
+        living = list(g.living)
+        for x in living:
+            x.knows_trade = x.knows_trade or knows_trade
+
+        def run():
+            for x in living:
+                event(x, g._world, information, False)
+        return run
+    return setup
+
+
+def _trade_graph(config, groups, radius):
+    def setup():
+        g = game(config, groups, radius=radius)
+        living = list(g.living)
+
+        def run():
+            graph = TradeGraph(living, g._population)
+            for x in living:
+                graph.neighbours(x)
+        return run
+    return setup
+
+
+def _names(config, names):
+    rules = config["Tribe"]["Tribes"][0]["Name-rules"]
+    generator = get_generator(rules["vowels"], rules["consonants"], rules["syllables"])
+
+    def setup():
+        def run():
+            for _ in range(names):
+                generator.compose(3)
+        return run
+    return setup
+
+
+def _startup(module):
+    def setup():
+        return lambda: Runner.import_time(module)
+    return setup
+
+
+def cases(config, quick=False):
+    """
+    The benchmark cases of the simulator.
+
+    The **startup** cases time a new interpreter importing the modules that must start fast. The sweeps cover the
+    number of groups, the initial population, the migration and trade radius and the size of the world. The quick
+    sweeps only keep the smallest values.
+
+    :param config: The configuration of the tribes.
+    :param quick: If True the sweeps are reduced.
+    :return: A list of :class:`Case`.
+    """
+    groups = [100, 1000] if quick else [100, 1000, 5000]
+    sizes = [256] if quick else [256, 1024, 4096]
+    populations = [1] if quick else [1, 10]
+    radii = [3] if quick else [3, 8, 16]
+    result = [Case("startup", {"module": module}, _startup(module)) for module in Runner.LIGHT_MODULES]
+    for n in groups:
+        result.append(Case("create_group", {"groups": n}, _create_group(config, n, 256), n))
+        for vectorized in [False, True]:
+            result.append(Case("turn", {"groups": n, "size": 256, "population": 1, "radius": 3,
+                                        "vectorized": vectorized},
+                               _turn(config, n, 256, 1, 3, vectorized), 5))
+    for size in sizes[1:]:
+        result.append(Case("turn", {"groups": groups[0], "size": size, "population": 1, "radius": 3,
+                                    "vectorized": False}, _turn(config, groups[0], size, 1, 3, False), 5))
+    for population in populations[1:]:
+        result.append(Case("turn", {"groups": groups[0], "size": 256, "population": population, "radius": 3,
+                                    "vectorized": False}, _turn(config, groups[0], 256, population, 3, False), 5))
+    for radius in radii:
+        for name, event, knows_trade in [("migrate", Events.migrate, False), ("trade", Events.trade, True),
+                                         ("develop_trade", Events.develop_trade, False)]:
+            result.append(Case(name, {"groups": groups[-1], "radius": radius},
+                               _event(config, event, groups[-1], radius, knows_trade), groups[-1]))
+        result.append(Case("trade_graph", {"groups": groups[-1], "radius": radius},
+                           _trade_graph(config, groups[-1], radius), groups[-1]))
+    for name, event in [("become_semi_sedentary", Events.become_semi_sedentary),
+                        ("discover_agriculture", Events.discover_agriculture),
+                        ("become_sedentary", Events.become_sedentary), ("dead", Events.dead)]:
+        result.append(Case(name, {"groups": groups[-1]}, _event(config, event, groups[-1], None), groups[-1]))
+    for n in [1000] if quick else [1000, 10000]:
+        result.append(Case("compose", {"names": n}, _names(config, n), n))
+    return result
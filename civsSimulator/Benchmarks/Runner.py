@@ -0,0 +1,128 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy
+
+VERSION = 1
+
+# The modules that must start without the heavy dependencies, and the time allowed to import each of them.
+LIGHT_MODULES = ["civsSimulator", "civsSimulator.__main__", "civsSimulator.Facts", "civsSimulator.Output",
+                 "civsSimulator.TribeConfig"]
+HEAVY_MODULES = ["numpy", "worldengine"]
+IMPORT_BUDGET = 0.05
+
+
+def measure(case, repeat=5):
+    """
+    Times a benchmark case.
+
+    :param case: The :class:`Cases.Case`.
+    :param repeat: The number of repetitions.
+    :return: A dictionary with the parameters, and the best and the median time per operation in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        run = case.setup()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) / case.number)
+    times.sort()
+    return {"name": case.name, "params": case.params, "best": times[0], "median": times[len(times) // 2]}
+
+
+def run(cases, repeat=5, only=None, progress=None):
+    """
+    Times many benchmark cases.
+
+    :param cases: A list of :class:`Cases.Case`.
+    :param repeat: The number of repetitions of every case.
+    :param only: If not None, a list of benchmark names to run, the other cases are skipped.
+    :param progress: If not None, a function called with the key and the result of every case when it is timed.
+    :return: A dictionary with the versions of the platform and a result for every case, keyed by
+             :attr:`Cases.Case.key`.
+    """
+    results = {}
+    for case in cases:
+        if only is not None and case.name not in only:
+            continue
+        results[case.key] = measure(case, repeat)
+        if progress is not None:
+            progress(case.key, results[case.key])
+    return {"version": VERSION, "python": platform.python_version(), "numpy": numpy.__version__,
+            "machine": platform.machine(), "results": results}
+
+
+def save(report, path):
+    """
+    Saves a report returned by :func:`run` as JSON.
+    """
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    """
+    Loads a report saved with :func:`save`.
+
+    :raises: ValueError if the file is not a benchmark report of the current version.
+    """
+    with open(path) as f:
+        report = json.load(f)
+    if report.get("version") != VERSION:
+        raise ValueError("{} is not a benchmark report of version {}.".format(path, VERSION))
+    return report
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares the best times of two reports.
+
+    :param baseline: The report used as reference.
+    :param current: The new report.
+    :param threshold: The relative slowdown allowed before a case is a regression, 0.1 is 10% slower.
+    :return: A list with a (key, baseline time, current time, ratio, regression) tuple for every case in both reports.
+    """
+    rows = []
+    for key in sorted(set(baseline["results"]) & set(current["results"])):
+        before = baseline["results"][key]["best"]
+        after = current["results"][key]["best"]
+        ratio = after / before if before > 0 else float("inf")
+        rows.append((key, before, after, ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def import_time(module):
+    """
+    Imports a module in a new interpreter, that finds this package first.
+
+    :param module: The name of the module.
+    :return: The seconds spent importing it, and a list with the :data:`HEAVY_MODULES` that have been imported.
+    """
+    code = ("import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            "import {}\n"
+            "print(json.dumps([time.perf_counter() - start, [m for m in {} if m in sys.modules]]))").format(
+        module, HEAVY_MODULES)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root] + [p for p in [os.environ.get("PYTHONPATH")] if p]))
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    seconds, heavy = json.loads(output.decode('utf-8'))
+    return seconds, heavy
+
+
+def check_imports(modules=None, budget=IMPORT_BUDGET):
+    """
+    Checks that the light modules import fast and without the heavy dependencies.
+
+    :param modules: The modules to check. If None :data:`LIGHT_MODULES` are checked.
+    :param budget: The seconds allowed to import every module.
+    :return: A list with a (module, seconds, heavy modules, ok) tuple for every module.
+    """
+    rows = []
+    for module in modules or LIGHT_MODULES:
+        seconds, heavy = import_time(module)
+        rows.append((module, seconds, heavy, seconds <= budget and not heavy))
+    return rows
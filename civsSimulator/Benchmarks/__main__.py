@@ -0,0 +1,58 @@
+from civsSimulator.Benchmarks import Cases, Runner
+import argparse
+import json
+import sys
+
+
+def _format(seconds):
+    for unit, factor in [("s", 1.0), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= factor:
+            return "{:.3f} {}".format(seconds / factor, unit)
+    return "{:.3f} ns".format(seconds / 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="civsSimulator.Benchmarks")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="Times the benchmarks and saves the results as JSON.")
+    run.add_argument('config', help='.json with the configuration of the tribes.')
+    run.add_argument('-o', '--output', help='File to save the results.', default="benchmarks.json")
+    run.add_argument('--repeat', help='The number of repetitions of every benchmark.', default=5, type=int)
+    run.add_argument('--quick', help='Runs reduced sweeps.', action='store_true')
+    run.add_argument('--only', help='The names of the benchmarks to run, like turn or migrate.', nargs='+')
+    compare = commands.add_parser("compare", help="Compares the results with a baseline and fails on regressions.")
+    compare.add_argument('baseline', help='The results used as reference.')
+    compare.add_argument('current', help='The new results.')
+    compare.add_argument('--threshold', help='The relative slowdown allowed, 0.1 is 10%% slower.', default=0.1,
+                         type=float)
+    imports = commands.add_parser("imports", help="Checks that the light modules import within the budget and "
+                                                  "without the heavy dependencies.")
+    imports.add_argument('--budget', help='The seconds allowed to import every module.',
+                         default=Runner.IMPORT_BUDGET, type=float)
+    opt = parser.parse_args()
+
+    if opt.command == "run":
+        with open(opt.config) as data_file:
+            config = json.load(data_file)
+        report = Runner.run(Cases.cases(config, opt.quick), opt.repeat, opt.only,
+                            lambda key, result: print("{:<70} {:>12}".format(key, _format(result["best"]))))
+        Runner.save(report, opt.output)
+    elif opt.command == "compare":
+        rows = Runner.compare(Runner.load(opt.baseline), Runner.load(opt.current), opt.threshold)
+        for key, before, after, ratio, regression in rows:
+            print("{:<70} {:>12} {:>12} {:>7.2f}x{}".format(key, _format(before), _format(after), ratio,
+                                                          "  REGRESSION" if regression else ""))
+        regressions = sum(1 for row in rows if row[4])
+        print("\n{} of {} benchmarks have regressed".format(regressions, len(rows)))
+        sys.exit(1 if regressions else 0)
+    elif opt.command == "imports":
+        rows = Runner.check_imports(budget=opt.budget)
+        for module, seconds, heavy, ok in rows:
+            print("{:<40} {:>12} {}".format(module, _format(seconds),
+                                           "ok" if ok else "FAILED " + " ".join(heavy)))
+        sys.exit(0 if all(row[3] for row in rows) else 1)
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import io
+import json
+import numpy
+from civsSimulator import Utils, Facts
+
+VERSION = 4
+
+
+def _states(samplers):
+    states = [s.get_state() for s in samplers]
+    keys = numpy.array([state[1] for state in states], dtype=numpy.uint32).reshape(-1, 624)
+    rest = numpy.array([state[2:] for state in states], dtype=float).reshape(-1, 3)
+    return keys, rest
+
+
+def _restore(samplers, keys, rest):
+    for sampler, k, (pos, has_gauss, gauss) in zip(samplers, keys, rest):
+        sampler.set_state(('MT19937', k, int(pos), int(has_gauss), gauss))
+
+
+def save(game, path):
+    """
+    Saves the state of a game in a compressed NumPy archive.
+
+    The checkpoint stores the turn, the configuration, the state of every group, the facts that have not been handed
+    to the subscribers yet and the state of the random streams. The world is not stored, it is referenced by its path
+    and the hash of its content.
+
+    :param game: The :class:`Game.Game` to save.
+    :param path: The file to write.
+    """
+    groups = game.groups
+    activities = game._activities()
+    names_state = game._names.getstate()
+    samplers = [game.sampler] + game._samplers
+    if game._population is not None:
+        samplers += game._population.samplers
+    sampler_keys, sampler_state = _states(samplers)
+    meta = {
+        'version': VERSION,
+        'turn': game.current_turn,
+        'world': game._world_path,
+        'world-hash': game.world_hash,
+        'config': game._config,
+        'vectorized': game._population is not None,
+        'activities': activities,
+        'names': [g.name for g in groups],
+        'seed': game.seed,
+        'random': [names_state[0], names_state[2]],
+        'published': game._published,
+        'facts': [list(f) for f in game.facts.pending()],
+    }
+    columns = {
+        'meta': numpy.frombuffer(json.dumps(meta).encode('utf-8'), dtype=numpy.uint8),
+        'tribe': numpy.array([game._tribes.index(g._tribe) for g in groups], dtype=numpy.int32),
+        'cohorts': numpy.array([[g._children, g._young_men, g._young_women, g._old_men, g._old_women]
+                                for g in groups], dtype=numpy.int64).reshape(-1, 5),
+        'wealth': numpy.array([g._wealth for g in groups], dtype=float),
+        'prosperity': numpy.array([g._last_prosperity for g in groups], dtype=float),
+        'position': numpy.array([g.position for g in groups], dtype=numpy.int64).reshape(-1, 2),
+        'nomadism': numpy.array([g.nomadism for g in groups], dtype=str),
+        'activities': numpy.array([[a in g.activities for a in activities] for g in groups],
+                                  dtype=bool).reshape(-1, len(activities)),
+        'knows-trade': numpy.array([g.knows_trade for g in groups], dtype=bool),
+        'random-state': numpy.array(names_state[1], dtype=numpy.int64),
+        'sampler-keys': sampler_keys,
+        'sampler-state': sampler_state,
+    }
+    with open(path, 'wb') as f:
+        numpy.savez_compressed(f, **columns)
+
+
+def load(cls, path, world=None, registry=None):
+    """
+    Restores a game saved with :func:`save`.
+
+    The random streams are restored too, so the restored game simulates the same future turns as the saved one.
+
+    :param cls: The :class:`Game.Game` class.
+    :param path: The checkpoint file.
+    :param world: The .world file. If None the path saved in the checkpoint is used.
+    :param registry: The :class:`Registry.Registry` used to resolve the functions of the configuration.
+    :return: The restored game.
+    :raises: ValueError if the checkpoint is not valid or the world is not the one of the checkpoint.
+    """
+    with open(path, 'rb') as f:
+        columns = dict(numpy.load(io.BytesIO(f.read())))
+    meta = json.loads(columns['meta'].tobytes().decode('utf-8'))
+    if meta['version'] != VERSION:
+        raise ValueError("{} is not a checkpoint of version {}.".format(path, VERSION))
+    world = world or meta['world']
+    world_hash = Utils.file_hash(world)
+    if world_hash != meta['world-hash']:
+        raise ValueError("The world {} is not the world of the checkpoint {}.".format(world, path))
+
+    game = cls.__new__(cls)
+    game._config = meta['config']
+    game._setup(world, meta['vectorized'], registry, meta['seed'])
+    game._world_hash = world_hash
+    activities = meta['activities']
+    for i, name in enumerate(meta['names']):
+        tribe = game._tribes[columns['tribe'][i]]
+        g = game._add_group(Utils.Position(*columns['position'][i].tolist()), tribe, name)
+        (g._children, g._young_men, g._young_women, g._old_men, g._old_women) = columns['cohorts'][i].tolist()
+        g._wealth = float(columns['wealth'][i])
+        g._last_prosperity = float(columns['prosperity'][i])
+        g.nomadism = str(columns['nomadism'][i])
+        g.activities = tuple(a for a, has in zip(activities, columns['activities'][i]) if has)
+        g.knows_trade = bool(columns['knows-trade'][i])
+    game._bury()
+    game._turn = meta['turn']
+    game.facts.turn = meta['turn']
+    game._published = meta['published']
+    # JSON turns the tuples of the facts, like the positions, into lists.
+    game.facts.restore([Facts.Fact(turn, id, name, text, {k: tuple(v) if isinstance(v, list) else v
+                                                          for k, v in data.items()})
+                        for turn, id, name, text, data in meta['facts']])
+    game._names.setstate((meta['random'][0], tuple(columns['random-state'].tolist()), meta['random'][1]))
+    samplers = [game.sampler] + game._samplers
+    if game._population is not None:
+        samplers += game._population.samplers
+    _restore(samplers, columns['sampler-keys'], columns['sampler-state'])
+    return game
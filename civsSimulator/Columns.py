@@ -0,0 +1,140 @@
+import numpy
+from civsSimulator.Population import COHORTS, NOMADISM
+
+
+def vectorized(function):
+    """
+    Marks a global event that works on the :class:`Columns` of the living groups.
+
+    A vectorized global event is called with the world, the columns, the information of the turn and the verbose flag,
+    and returns None or the :class:`Effects` the game applies to the groups at once.
+
+    :param function: The event.
+    :return: The same function.
+    """
+    function.vectorized = True
+    return function
+
+
+class Effects:
+    """This class represents the changes a vectorized global event makes to the living groups.
+
+    Every array has a row per group, in the order of the :class:`Columns`. A group is affected if it is killed or if
+    its cohorts or its wealth change, and a fact is recorded for every affected group.
+
+    :param kill: A boolean array with the groups that die.
+    :param cohorts: An array with the change of the children, young men, young women, old men and old women of every
+                    group. The cohorts do not go below 0.
+    :param wealth: An array with the change of the wealth of every group.
+    :param text: The description of the facts, formatted with the **name** of every affected group. Only used if the
+                 event is verbose.
+    """
+    def __init__(self, kill=None, cohorts=None, wealth=None, text=None):
+        self.kill = kill
+        self.cohorts = cohorts
+        self.wealth = wealth
+        self.text = text
+
+
+class Columns:
+    """This class represents the state of the living groups as arrays, with a row per group.
+
+    The columns are read the first time they are used, from the :class:`Population.Population` if the game is
+    vectorized, or from the groups otherwise, so an event that does not trigger does not read them.
+
+    The available columns are **prosperity**, **cohorts** (with the :data:`Population.COHORTS` as columns),
+    **population**, **wealth**, **x**, **y**, **type** (the index in :attr:`types`) and **nomadism** (the index in
+    :data:`Population.NOMADISM`).
+
+    :param groups: The living groups.
+    :param population: The :class:`Population.Population` that stores the groups, if the game is vectorized.
+    """
+    def __init__(self, groups, population=None):
+        self.groups = groups
+        self.size = len(groups)
+        self._population = population
+        self._rows = None
+        if population is not None:
+            self._rows = numpy.array([g._index for g in groups], dtype=numpy.int64)
+        self.types = []
+        for g in groups:
+            if g.type not in self.types:
+                self.types.append(g.type)
+        self._cache = {}
+
+    def _read(self, name, function, dtype, population_column=None):
+        if name not in self._cache:
+            if self._rows is not None and population_column is not None:
+                self._cache[name] = getattr(self._population, population_column)[self._rows]
+            else:
+                self._cache[name] = numpy.array([function(g) for g in self.groups], dtype=dtype)
+        return self._cache[name]
+
+    @property
+    def prosperity(self):
+        return self._read("prosperity", lambda g: g.prosperity, float, "prosperity")
+
+    @property
+    def cohorts(self):
+        cohorts = self._read("cohorts", lambda g: (g._children, g._young_men, g._young_women, g._old_men,
+                                                   g._old_women), numpy.int64, "cohorts")
+        return cohorts.reshape((self.size, len(COHORTS)))
+
+    @property
+    def population(self):
+        return self.cohorts.sum(axis=1)
+
+    @property
+    def wealth(self):
+        return self._read("wealth", lambda g: g._wealth, float, "wealth")
+
+    @property
+    def x(self):
+        return self._read("x", lambda g: g.position[0], numpy.int64, "x")
+
+    @property
+    def y(self):
+        return self._read("y", lambda g: g.position[1], numpy.int64, "y")
+
+    @property
+    def type(self):
+        return self._read("type", lambda g: self.types.index(g.type), numpy.int32)
+
+    @property
+    def nomadism(self):
+        return self._read("nomadism", lambda g: NOMADISM.index(g.nomadism), numpy.int8)
+
+    def has_activity(self, activity):
+        """
+        The groups that have an activity.
+
+        :param activity: The name of the activity.
+        :return: A boolean array.
+        """
+        return self._read("activity-" + activity, lambda g: activity in g.activities, bool)
+
+    def assign(self, name, rows, values):
+        """
+        Writes new values of the cohorts or the wealth of some groups.
+
+        :param name: **cohorts** or **wealth**.
+        :param rows: The rows of the groups.
+        :param values: The new values, with a row for every row in rows.
+        :raises: ValueError if the column can not be written.
+        """
+        if name not in ("cohorts", "wealth"):
+            raise ValueError("The column {} can not be written.".format(name))
+        getattr(self, name)[rows] = values
+        if self._rows is not None:
+            getattr(self._population, name)[self._rows[rows]] = values
+        elif name == "cohorts":
+            for row, (children, young_men, young_women, old_men, old_women) in zip(rows, values.tolist()):
+                g = self.groups[row]
+                g._children = children
+                g._young_men = young_men
+                g._young_women = young_women
+                g._old_men = old_men
+                g._old_women = old_women
+        else:
+            for row, wealth in zip(rows, values.tolist()):
+                self.groups[row]._wealth = wealth
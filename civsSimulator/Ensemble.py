@@ -0,0 +1,105 @@
+import json
+import multiprocessing
+from civsSimulator.Game import Game
+
+_worker = {}
+
+
+class Summary:
+    """This class represents the summary of a run of an ensemble.
+
+    It is subscribed to the facts of the game to find the turn of the first sedentary group.
+
+    :param seed: The seed of the run.
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.first_sedentary = None
+        self.first_agriculture = None
+        self.collapse = None
+
+    def add(self, turn, facts):
+        """
+        Checks the facts of a turn, see :func:`Game.Game.subscribe`.
+        """
+        for f in facts:
+            if self.first_sedentary is None and f.data.get('nomadism') == 'sedentary':
+                self.first_sedentary = turn
+            if self.first_agriculture is None and f.data.get('agricult'):
+                self.first_agriculture = turn
+
+    def result(self, game):
+        """
+        The summary of the run.
+
+        :param game: The game at the end of the run.
+        :return: A dictionary with the summary.
+        """
+        alive = game.living
+        return {'seed': self.seed, 'turns': game.current_turn, 'groups': len(game.groups), 'alive': len(alive),
+                'population': sum(g.total_persons for g in alive),
+                'sedentary': sum(1 for g in alive if g.nomadism == 'sedentary'),
+                'first-sedentary': self.first_sedentary, 'first-agriculture': self.first_agriculture,
+                'collapse': self.collapse}
+
+
+def _init_worker(config, world):
+    with open(config) as data_file:
+        _worker['config'] = json.load(data_file)
+    _worker['world'] = Game.open_world(world)
+
+
+def _run(task):
+    seed, groups, turns, vectorized = task
+    game = Game(_worker['config'], _worker['world'], vectorized, seed=seed)
+    summary = Summary(seed)
+    game.subscribe(summary.add)
+    game.create_groups(groups)
+    for i in range(turns):
+        game.turn()
+        if not game.living:
+            summary.collapse = game.current_turn
+            break
+    return summary.result(game)
+
+
+def run(config, world, runs, groups, turns, seed=0, workers=None, vectorized=False):
+    """
+    Runs many seeded simulations of the same world in a pool of processes.
+
+    Every worker opens the world and reads the configuration once, and runs the simulations with seeds seed,
+    seed + 1, ... seed + runs - 1.
+
+    :param config: The .json file with the configuration of the tribes.
+    :param world: The .world file where the groups will be simulated.
+    :param runs: The number of simulations.
+    :param groups: The number of groups of every simulation.
+    :param turns: The number of turns of every simulation.
+    :param seed: The seed of the first simulation.
+    :param workers: The number of processes. If None the number of CPUs is used.
+    :param vectorized: If True the simulations use the vectorized population.
+    :return: A generator of the summaries of the runs, as dictionaries, in the order they finish.
+    """
+    tasks = [(seed + i, groups, turns, vectorized) for i in range(runs)]
+    # Fills the world cache once, so the workers only map it.
+    Game.open_world(world)
+    with multiprocessing.Pool(workers, _init_worker, (config, world)) as pool:
+        for summary in pool.imap_unordered(_run, tasks):
+            yield summary
+
+
+def aggregate(summaries):
+    """
+    Aggregates the summaries of an ensemble.
+
+    :param summaries: A list with the summaries of the runs.
+    :return: A dictionary with the number of runs, and the number, mean, minimum and maximum of the collapse, first
+             sedentary and first agriculture turns of the runs where they happened.
+    """
+    result = {'runs': len(summaries)}
+    for key in ['collapse', 'first-sedentary', 'first-agriculture']:
+        values = [s[key] for s in summaries if s[key] is not None]
+        result[key] = {'count': len(values)}
+        if values:
+            result[key].update({'mean': sum(values) / len(values), 'min': min(values), 'max': max(values)})
+    return result
@@ -1,7 +1,6 @@
-import random
+import numpy
 from civsSimulator import Utils
 import math
-import itertools
 
 # ================================================
 # ====     Helper functions for the events    ====
@@ -43,51 +42,31 @@ def chance_to_become_sedentary(group):
         return 0
 
 
-def inside_world(world, pos):
-    return 0 < pos[0] < world.width and 0 < pos[1] < world.height
-
-
-def is_land(world, pos):
-    return world.biome_at(pos).name() != "ocean"
-
-
 def land_cells_around(world, pos, radius, occupied_positions):
-    rad = range(-radius, radius + 1)
-    positions = itertools.product(rad, rad)
-    filtered = (Utils.add_list(pos, p) for p in positions if inside_world(world, Utils.add_list(pos, p)))
-    land = (p for p in filtered if is_land(world, p))
-    return (p for p in land if p not in occupied_positions)
-
-
-def groups_around(pos, radius, occupied_positions):
-    rad = range(-radius, radius + 1)
-    positions = itertools.product(rad, rad)
-    return len([p for p in positions if Utils.add_list(pos, p) in occupied_positions and not p == (0, 0)])
-
-
-def groups_around_info(pos, radius, groups):
-    rad = range(-radius, radius + 1)
-    positions = itertools.product(rad, rad)
-    occupied = [g.position for g in groups]
-    g_positions = [Utils.add_list(pos, p) for p in positions if Utils.add_list(pos, p) in occupied and not p == (0, 0)]
-    return [g for g in groups if g.position in g_positions]
-
+    """
+    The free land cells in the square of the given radius around a position.
 
-class _exhausted:
-    pass
+    :return: The (x0, y0, x1, y1) bounds of the square inside the world, and a mask of the free land cells in it.
+    """
+    x0 = max(pos[0] - radius, 1)
+    y0 = max(pos[1] - radius, 1)
+    x1 = min(pos[0] + radius + 1, world.width)
+    y1 = min(pos[1] + radius + 1, world.height)
+    free = world.land[y0:y1, x0:x1] & (occupied_positions.grid[y0:y1, x0:x1] == 0)
+    return (x0, y0, x1, y1), free
 
 
 def chance_to_migrate(group, world, occupied_positions):
-    positions = land_cells_around(world, group.position, group.migration_radius, occupied_positions)
-    if next(positions, _exhausted) == _exhausted:
+    bounds, free = land_cells_around(world, group.position, group.migration_radius, occupied_positions)
+    if not free.any():
         return 0
     else:
         return (1 - group.prosperity) * group.migration_rate
 
 
-def chance_to_develop_trade(group, occupied_positions):
+def chance_to_develop_trade(group, trade_graph):
     if group.nomadism == "sedentary" and not group.knows_trade:
-        neighbours = groups_around(group.position, group.trade_radius, occupied_positions)
+        neighbours = len(trade_graph.neighbours(group))
         if neighbours > 0:
             prosperity = group.prosperity
             if prosperity > 0.8:
@@ -102,7 +81,7 @@ def chance_to_develop_trade(group, occupied_positions):
 
 def chance_to_trade(group, information):
     if group.knows_trade:
-        neighbours = groups_around_info(group.position, group.trade_radius, information["groups"])
+        neighbours = information["trade-graph"].neighbours(group)
         chance = Utils.saturate(len(neighbours) / (group.trade_radius * group.trade_radius - 1), 0.8)
         return [chance, neighbours]
     return [0, 0]
@@ -116,111 +95,83 @@ def become_semi_sedentary(group, world, information, verbose):
     """
     This event checks if a group can evolve to semi sedentary.
 
-    If the event occurs a fact is added to the group.
+    If the event occurs a fact is recorded for the group.
 
     :param group: The group to check.
     :param world: The world.
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
-    if random.random() < chance_to_become_semi_sedentary(group):
+    if group.sampler.uniform() < chance_to_become_semi_sedentary(group):
         group.nomadism = "semi-sedentary"
         fact = "{} is converting to semi-sedentarism.".format(group.name)
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
-        if information["turn"] in group.file_facts:
-            group.file_facts[information["turn"]]['nomadism'] = 'semi-sedentary'
-        else:
-            group.file_facts[information["turn"]] = {'nomadism': 'semi-sedentary'}
+        information["facts"].record(group, fact if verbose else None, nomadism='semi-sedentary')
 
 
 def discover_agriculture(group, world, information, verbose):
     """
     This event checks if a group discovers agriculture.
 
-    If the event occurs a fact is added to the group.
+    If the event occurs a fact is recorded for the group.
 
     :param group: The group to check.
     :param world: The world.
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
-    if random.random() < chance_to_discover_agriculture(group, world):
-        group.activities.append("Agriculture")
+    if group.sampler.uniform() < chance_to_discover_agriculture(group, world):
+        group.add_activity("Agriculture")
         fact = "{} has discovered agriculture.".format(group.name)
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
-        if information["turn"] in group.file_facts:
-            group.file_facts[information["turn"]]['agricult'] = True
-        else:
-            group.file_facts[information["turn"]] = {'agricult': True}
+        information["facts"].record(group, fact if verbose else None, agricult=True)
 
 
 def become_sedentary(group, world, information, verbose):
     """
     This event checks if a group can evolve to sedentary.
 
-    If the event occurs a fact is added to the group.
+    If the event occurs a fact is recorded for the group.
 
     :param group: The group to check.
     :param world: The world.
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
-    if random.random() < chance_to_become_sedentary(group):
+    if group.sampler.uniform() < chance_to_become_sedentary(group):
         group.nomadism = "sedentary"
         fact = "{} is converting to sedentarism.".format(group.name)
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
-        if information["turn"] in group.file_facts:
-            group.file_facts[information["turn"]]['nomadism'] = 'sedentary'
-        else:
-            group.file_facts[information["turn"]] = {'nomadism': 'sedentary'}
+        information["facts"].record(group, fact if verbose else None, nomadism='sedentary')
 
 
 def migrate(group, world, information, verbose):
     """
     This event checks if a group migrates from it's current position.
 
-    If the event occurs a fact is added to the group.
+    If the event occurs a fact is recorded for the group.
 
     :param group: The group to check.
     :param world: The world.
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
-    if random.random() < chance_to_migrate(group, world, information["occupied_positions"]):
-        positions = land_cells_around(world, group.position, group.migration_radius, information["occupied_positions"])
-        prosperity = ([Utils.perturbate_low(group.get_prosperity(world, p)), p] for p in positions)
-        best = max(prosperity)
-        group.position = best[1]
-        fact = "{} is moving to better lands {}.".format(group.name, best[1])
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
-
-        if information["turn"] in group.file_facts:
-            group.file_facts[information["turn"]]['pos'] = best[1]
-        else:
-            group.file_facts[information["turn"]] = {'pos': best[1]}
+    if group.sampler.uniform() < chance_to_migrate(group, world, information["occupied_positions"]):
+        bounds, free = land_cells_around(world, group.position, group.migration_radius,
+                                         information["occupied_positions"])
+        x0, y0, x1, y1 = bounds
+        prosperity = group.get_prosperity_area(world, x0, y0, x1, y1)
+        prosperity = numpy.clip(prosperity + (group.sampler.uniform(prosperity.shape) - 0.5) * 0.2, 0.0, 1.0)
+        prosperity[~free] = -1.0
+        y, x = numpy.unravel_index(numpy.argmax(prosperity), prosperity.shape)
+        best = (int(x0 + x), int(y0 + y))
+        information["occupied_positions"].move(group, best)
+        fact = "{} is moving to better lands {}.".format(group.name, best)
+        information["facts"].record(group, fact if verbose else None, pos=best)
 
 
 def dead(group, world, information, verbose):
     """
     This event checks if a group is dead.
 
-    If the event occurs a fact is added to the group.
+    If the event occurs a fact is recorded for the group.
 
     :param group: The group to check.
     :param world: The world.
@@ -229,15 +180,7 @@ def dead(group, world, information, verbose):
     """
     if group.is_dead:
         fact = "{} has dead.".format(group.name)
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
-        if information["turn"] in group.file_facts:
-            group.file_facts[information["turn"]]['dead'] = True
-        else:
-            group.file_facts[information["turn"]] = {'dead': True}
+        information["facts"].record(group, fact if verbose else None, dead=True)
 
 
 def develop_trade(group, world, information, verbose):
@@ -250,35 +193,27 @@ def develop_trade(group, world, information, verbose):
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
-    if random.random() < chance_to_develop_trade(group, information["occupied_positions"]):
+    if group.sampler.uniform() < chance_to_develop_trade(group, information["trade-graph"]):
         group.knows_trade = True
         fact = "{} has develop trade.".format(group.name)
-        if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
+        information["facts"].record(group, fact if verbose else None)
 
 
 def trade(group, world, information, verbose):
     """
     This event makes a trade.
 
-    If we trade with a neighbour we update the wealth of the two groups.
+    If we trade with a neighbour the wealth of the two groups is updated at the end of the events of the turn, see
+    :class:`Trade.TradeGraph`.
     :param group: The group to check.
     :param world: The world
     :param information: A dictionary with the information for the events.
     :param verbose: True if the event has to register into facts, False otherwise
     """
     trade_chance = chance_to_trade(group, information)
-    if random.random() < trade_chance[0]:
-        fact = "{} is trading with: ".format(group.name)
-        for n in trade_chance[1]:
-            n.trade(group.prosperity)
-            group.trade(n.prosperity)
-            fact += n.name + " "
+    if group.sampler.uniform() < trade_chance[0]:
+        information["trade-graph"].trade(group, trade_chance[1])
+        fact = None
         if verbose:
-            if information["turn"] in group.facts:
-                group.facts[information["turn"]].append(fact)
-            else:
-                group.facts[information["turn"]] = [fact]
+            fact = "{} is trading with: ".format(group.name) + "".join(n.name + " " for n in trade_chance[1])
+        information["facts"].record(group, fact)
@@ -0,0 +1,157 @@
+import struct
+import numpy
+
+MAGIC = b'CIVSFACT'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+
+RECORD = numpy.dtype([('turn', '<u4'), ('group', '<u4'), ('event', '<u2'), ('a', '<i4'), ('b', '<i4')])
+
+POSITION = 1
+NOMADISM = 2
+AGRICULTURE = 3
+DEAD = 4
+
+NOMADISM_CODES = ["nomadic", "semi-sedentary", "sedentary"]
+
+
+def encode(turn, group, fact):
+    """
+    Converts the file fact of a group to records.
+
+    The payload of every record is stored in the **a** and **b** columns:
+        * **POSITION**: the x and y of the new position.
+        * **NOMADISM**: the index of the new culture in :data:`NOMADISM_CODES`.
+        * **AGRICULTURE** and **DEAD**: no payload.
+
+    :param turn: The turn of the fact.
+    :param group: The id of the group.
+    :param fact: The fact dictionary, with the 'pos', 'nomadism', 'agricult' and 'dead' keys written by the events.
+    :return: A list with a record tuple for every key of the fact.
+    :raises: ValueError if the fact has an unknown key.
+    """
+    records = []
+    for key, value in fact.items():
+        if key == 'pos':
+            records.append((turn, group, POSITION, value[0], value[1]))
+        elif key == 'nomadism':
+            records.append((turn, group, NOMADISM, NOMADISM_CODES.index(value), 0))
+        elif key == 'agricult':
+            records.append((turn, group, AGRICULTURE, 0, 0))
+        elif key == 'dead':
+            records.append((turn, group, DEAD, 0, 0))
+        else:
+            raise ValueError("Unknown fact {} can not be stored in a fact log.".format(key))
+    return records
+
+
+class FactLogWriter:
+    """This class represents a writer of the facts of a simulation as a binary log.
+
+    The log is a header followed by fixed width records of (turn, group, event, a, b), see :data:`RECORD`. The records
+    are buffered and written in chunks. The names of the groups are not stored.
+
+    :param path: The file to write.
+    :param chunk_size: The number of records written at once.
+    """
+    def __init__(self, path, chunk_size=65536):
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.itemsize))
+        self._buffer = numpy.zeros(chunk_size, dtype=RECORD)
+        self._size = 0
+
+    def write(self, turn, facts):
+        """
+        Writes the facts of a turn.
+
+        :param turn: The turn.
+        :param facts: A list with the facts of the turn, as dictionaries with the 'id' of the group and the 'fact'.
+        """
+        for f in facts:
+            for record in encode(turn, f['id'], f['fact']):
+                self._buffer[self._size] = record
+                self._size += 1
+                if self._size == len(self._buffer):
+                    self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        self._file.write(self._buffer[:self._size].tobytes())
+        self._file.flush()
+        self._size = 0
+
+    def close(self):
+        """
+        Writes the buffered records and closes the file.
+        """
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class FactLogReader:
+    """This class represents a binary fact log opened for reading.
+
+    The records are memory mapped, and every column is a NumPy view of the file.
+
+    :param path: The file to read.
+    :raises: ValueError if the file is not a fact log.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, version, size = HEADER.unpack(f.read(HEADER.size))
+            f.seek(0, 2)
+            length = f.tell() - HEADER.size
+        if magic != MAGIC or version != VERSION or size != RECORD.itemsize:
+            raise ValueError("{} is not a fact log of version {}.".format(path, VERSION))
+        if length < RECORD.itemsize:
+            self.records = numpy.zeros(0, dtype=RECORD)
+        else:
+            self.records = numpy.memmap(path, dtype=RECORD, mode='r', offset=HEADER.size,
+                                        shape=(length // RECORD.itemsize,))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def turn(self):
+        return self.records['turn']
+
+    @property
+    def group(self):
+        return self.records['group']
+
+    @property
+    def event(self):
+        return self.records['event']
+
+    @property
+    def a(self):
+        return self.records['a']
+
+    @property
+    def b(self):
+        return self.records['b']
+
+    def of_event(self, event):
+        """
+        The records of an event.
+
+        :param event: The event code, like :data:`POSITION`.
+        :return: A structured array with the records.
+        """
+        return self.records[self.records['event'] == event]
+
+
+def read(path):
+    """
+    Opens a binary fact log, see :class:`FactLogReader`.
+    """
+    return FactLogReader(path)
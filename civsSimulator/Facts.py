@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+Fact = namedtuple('Fact', ['turn', 'id', 'name', 'text', 'data'])
+
+
+class FactBuffer:
+    """This class represents the buffer where the events record the facts of the current turn.
+
+    The :class:`Game.Game` sets the current :attr:`turn`, the events add the facts with :func:`record`, and at the end
+    of the turn the game takes them with :func:`drain` and hands them to its subscribers. :attr:`recorded` counts the
+    calls to :func:`record`, including the ones without anything to keep.
+    """
+    def __init__(self):
+        self.turn = 0
+        self.recorded = 0
+        self._facts = []
+
+    def __len__(self):
+        return len(self._facts)
+
+    def record(self, group, text=None, **data):
+        """
+        Records a fact of a group in the current turn.
+
+        :param group: The group.
+        :param text: The description of the fact, or None if it does not have to be printed.
+        :param data: The values to save in the output, like **pos** or **nomadism**.
+        """
+        self.recorded += 1
+        if text is None and not data:
+            return
+        self._facts.append(Fact(self.turn, group.id, group.name, text, data))
+
+    def pending(self):
+        """
+        The recorded facts that have not been drained yet.
+
+        :return: A list of :class:`Fact`.
+        """
+        return list(self._facts)
+
+    def restore(self, facts):
+        """
+        Adds facts taken with :func:`pending`, like the ones of a checkpoint, so they are drained with the next ones.
+
+        :param facts: A list of :class:`Fact`.
+        """
+        self._facts.extend(facts)
+
+    def drain(self):
+        """
+        Takes all the recorded facts out of the buffer.
+
+        :return: A list of (turn, facts) tuples sorted by turn.
+        """
+        batches = []
+        for fact in self._facts:
+            if not batches or batches[-1][0] != fact.turn:
+                batches.append((fact.turn, []))
+            batches[-1][1].append(fact)
+        self._facts = []
+        return batches
+
+
+def texts(facts):
+    """
+    The descriptions of the given facts.
+
+    :param facts: A list of :class:`Fact`.
+    :return: A list with the texts.
+    """
+    return [f.text for f in facts if f.text is not None]
+
+
+def file_facts(facts):
+    """
+    The values of the given facts merged by group, as they are saved in the output.
+
+    :param facts: A list of :class:`Fact`.
+    :return: A list with an {'id', 'name', 'fact'} dictionary for every group with values.
+    """
+    merged = {}
+    for f in facts:
+        if f.data:
+            if f.id not in merged:
+                merged[f.id] = {'id': f.id, 'name': f.name, 'fact': {}}
+            merged[f.id]['fact'].update(f.data)
+    return list(merged.values())
@@ -1,44 +1,385 @@
 import json
 import random
-from worldengine.world import World
+import numpy
 from civsSimulator.Group import Group
-from civsSimulator import Utils, GlobalEvents
+from civsSimulator.Population import Population, GroupView
+from civsSimulator.Map import Map
+from civsSimulator.Occupancy import Occupancy
+from civsSimulator.TribeConfig import TribeConfig
+from civsSimulator.Facts import FactBuffer
+from civsSimulator.Profiler import Profiler, DISABLED
+from civsSimulator.Trade import TradeGraph
+from civsSimulator.Columns import Columns
+from civsSimulator import Utils, Registry, Sampling, Checkpoint, Worlds, WorldCache
+
+# The number of groups that share a random stream.
+BLOCK = 256
+
+
+def _open_protobuf(path):
+    from worldengine.world import World
+    return World.open_protobuf(path)
 
 
 class Game:
+    """This class represents a simulation.
 
-    def __init__(self, config, world):
-        self.groups = []
+    :param config: The .json file with the configuration of the tribes, or the already loaded configuration.
+    :param world: The file of the world where the groups will be simulated, see :func:`open_world`, an already
+                  opened :class:`Map.Map`, so many games can share the same world, or any world with a **width**, a
+                  **height** and a **biome_at** function, like a :class:`Worlds.ArrayWorld`.
+    :param vectorized: If True the population of all the groups is stored in a :class:`Population.Population` and
+                       updated at once every turn, before the events of the groups are checked.
+    :param registry: The :class:`Registry.Registry` used to resolve the events and the name functions of the
+                     configuration. If None the default registry is used.
+    :param seed: The master seed of the random streams. If None a random one is used.
+    :raises: ValueError if the configuration references an unknown event or name function.
+
+    :attr:`groups` has every group ever created, indexed by its id. The groups that are alive are also in
+    :attr:`living`, and when a group dies it is moved to :attr:`dead` and its cell is freed, so the cost of a turn
+    depends on the living groups only.
+
+    The global events are checked once per turn, after the events of the groups. The events marked with
+    :func:`Columns.vectorized` receive the state of all the living groups as :class:`Columns.Columns` and return the
+    :class:`Columns.Effects` that the game applies to all the groups at once.
+
+    The events record the facts of every turn in :attr:`facts`, and at the end of the turn they are handed to the
+    functions registered with :func:`subscribe`.
+
+    The groups draw from a random stream per block of :data:`BLOCK` ids, derived from the master seed and the block
+    with :func:`Sampling.stream`, and the game draws from a stream of its own to place the groups and for the global
+    events. The names of the groups are drawn from another stream of the game, so the game does not use the random
+    module. A turn first updates the population of all the living groups, and then checks the events of the groups
+    one after the other.
+    """
+    def __init__(self, config, world, vectorized=False, registry=None, seed=None):
         self._config = {}
         self.load_config(config)
-        self._world = World.open_protobuf(world)
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self._setup(world, vectorized, registry, seed)
+
+    def _setup(self, world, vectorized, registry, seed):
+        self.seed = seed
+        self.sampler = Sampling.stream(seed, 'game')
+        self._samplers = []
+        self._names = Sampling.python_stream(seed, 'names')
+        self.groups = []
+        self.living = []
+        self._buried = 0
+        self.dead = []
+        self.facts = FactBuffer()
+        self.profiler = None
+        self._subscribers = []
+        self._published = -1
+        self._registry = registry or Registry.default
+        self._load_tribes()
+        self._world_hash = None
+        if isinstance(world, str):
+            self._world_path = world
+            self._world = self.open_world(world)
+        else:
+            self._world_path = None
+            self._world = world if isinstance(world, Map) else Map(world)
+        self._load_prosperity()
+        self._occupancy = Occupancy(self._world.width, self._world.height)
         self._turn = 0
-        self._global_events = self._config["Tribe"]["General"]["Global-events"]
+        self._population = None
+        if vectorized:
+            self._population = Population(self._activities(), seed=seed)
+
+    def _activities(self):
+        activities = []
+        for tribe in self._tribes:
+            for a in tribe["Max-population-for-activity"]:
+                if a not in activities:
+                    activities.append(a)
+        return activities
+
+    def _load_tribes(self):
+        general = self._config["Tribe"]["General"]
+        self._tribes = [TribeConfig(tribe, general, self._registry) for tribe in self._config["Tribe"]["Tribes"]]
+        self._global_events = self._registry.compile(general["Global-events"])
+
+    def _load_prosperity(self):
+        for tribe in self._tribes:
+            tribe.prosperity = {activity: self._world.prosperity(table)
+                                for activity, table in tribe["Biomes-prosperity-per-activity"].items()}
 
     def load_config(self, config):
+        if isinstance(config, dict):
+            self._config = config
+            return
         with open(config) as data_file:
             self._config = json.load(data_file)
 
+    @staticmethod
+    def open_world(world, cache=True):
+        """
+        Opens the file of a world.
+
+        A .png file is read as a biome image with :func:`Worlds.from_image`, any other file is opened as a WorldEngine
+        world. The biomes are read through the :mod:`WorldCache`, so a file is only decoded the first time.
+
+        :param world: The path of the file.
+        :param cache: If False the file is decoded without the cache.
+        :return: The :class:`Map.Map` of the world.
+        """
+        opener = Worlds.from_image if world.lower().endswith(".png") else _open_protobuf
+        if cache:
+            return Map(WorldCache.load(world, opener))
+        return Map(opener(world))
+
+    @property
+    def world_hash(self):
+        """
+        The content hash of the world file.
+        """
+        if self._world_path is None:
+            raise ValueError("The game has been created with an opened world, without a world file.")
+        if self._world_hash is None:
+            self._world_hash = Utils.file_hash(self._world_path)
+        return self._world_hash
+
+    def save_checkpoint(self, path):
+        """
+        Saves the state of the simulation, see :func:`Checkpoint.save`.
+
+        :param path: The file to write.
+        """
+        Checkpoint.save(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path, world=None, registry=None):
+        """
+        Restores a simulation saved with :func:`save_checkpoint`, see :func:`Checkpoint.load`.
+
+        :param path: The checkpoint file.
+        :param world: The .world file. If None the path saved in the checkpoint is used.
+        :param registry: The :class:`Registry.Registry` used to resolve the functions of the configuration.
+        :return: The restored game.
+        """
+        return Checkpoint.load(cls, path, world, registry)
+
+    @property
+    def current_turn(self):
+        """
+        The number of the last simulated turn.
+        """
+        return self._turn
+
+    def profile(self):
+        """
+        Instruments the game with a :class:`Profiler.Profiler`.
+
+        From then on the events of the tribes, the global events and the phases of every turn record their calls, time
+        and triggers in :attr:`profiler`.
+
+        :return: The profiler.
+        """
+        if self.profiler is None:
+            self.profiler = Profiler(self.facts)
+            for tribe in self._tribes:
+                tribe.events = self.profiler.wrap(tribe.events)
+            self._global_events = self.profiler.wrap(self._global_events)
+            for g in self.living:
+                g._events = g._tribe.events
+        return self.profiler
+
+    def _phase(self, name):
+        return DISABLED if self.profiler is None else self.profiler.phase(name)
+
+    def subscribe(self, callback):
+        """
+        Registers a function to receive the facts of every turn.
+
+        The function is called with the turn and a list of :class:`Facts.Fact` at the end of every turn, with an empty
+        list if nothing happened. The facts of the groups created before a turn are handed at the start of that turn,
+        with the turn before it.
+
+        :param callback: The function.
+        """
+        self._subscribers.append(callback)
+
+    def _publish(self):
+        batches = self.facts.drain()
+        # Every finished turn is handed once even without facts, so the outputs have an entry for every turn.
+        done = set(turn for turn, _ in batches)
+        batches += [(turn, []) for turn in range(self._published + 1, self._turn + 1) if turn not in done]
+        batches.sort(key=lambda batch: batch[0])
+        self._published = max(self._published, self._turn)
+        for turn, facts in batches:
+            for callback in self._subscribers:
+                callback(turn, facts)
+
     def create_group(self):
-        tribe_info = random.choice(self._config["Tribe"]["Tribes"])
-        if "Unhospital-biomes" in tribe_info:
-            unhosp_biomes = tribe_info["Unhospital-biomes"]
-        else:
-            unhosp_biomes = self._config["Tribe"]["General"]["Unhospital-biomes"]
+        """
+        Creates a new group in a random habitable position.
+
+        :return: The new group.
+        """
+        return self.create_groups(1)[0]
+
+    def create_groups(self, n, avoid_occupied=False):
+        """
+        Creates many groups at once.
+
+        The tribe of every group is chosen at random, and the positions are sampled from the habitable cells of each
+        tribe, the cells that are not in its **Unhospital-biomes**.
 
-        p = Utils.Position(random.randrange(0, self._world.width), random.randrange(0, self._world.height))
-        while self._world.biome_at((p.x, p.y)).name() in unhosp_biomes:
-            p = Utils.Position(random.randrange(0, self._world.width), random.randrange(0, self._world.height))
-        t = Group(p, tribe_info, self._config["Tribe"]["General"], len(self.groups))
+        :param n: The number of groups to create.
+        :param avoid_occupied: If True the groups are placed in cells without any other group.
+        :return: A list with the new groups.
+        :raises: ValueError if there are not enough habitable cells.
+        """
+        with self._phase("create-groups"):
+            return self._create_groups(n, avoid_occupied)
+
+    def _create_groups(self, n, avoid_occupied):
+        tribes = [self._tribes[i] for i in self.sampler.choice(len(self._tribes), n)]
+        positions = {}
+        names = {}
+        for tribe in [t for t in self._tribes if t in tribes]:
+            count = tribes.count(tribe)
+            cells = self._world.habitable_cells(tribe["Unhospital-biomes"])
+            if avoid_occupied:
+                cells = cells[self._occupancy.grid.flat[cells] == 0]
+                for p in positions.values():
+                    cells = numpy.setdiff1d(cells, p, assume_unique=True)
+            if len(cells) == 0 or (avoid_occupied and len(cells) < count):
+                raise ValueError("There are not enough habitable cells to place {} groups of the tribe {}.".format(
+                    count, tribe.type))
+            positions[tribe] = list(self.sampler.choice(cells, count, replace=not avoid_occupied))
+            with self._phase("names"):
+                names[tribe] = tribe.names(count, self._names)
+        groups = []
+        for tribe in tribes:
+            y, x = divmod(int(positions[tribe].pop()), self._world.width)
+            t = self._add_group(Utils.Position(x, y), tribe, names[tribe].pop())
+            self.facts.record(t, pos=t.position, nomadism=t.nomadism)
+            groups.append(t)
+        return groups
+
+    def _add_group(self, position, tribe, name):
+        sampler = self._group_sampler(len(self.groups))
+        if self._population is not None:
+            t = GroupView(self._population, position, tribe, len(self.groups), name, sampler)
+        else:
+            t = Group(position, tribe, len(self.groups), name, sampler)
         self.groups.append(t)
+        self.living.append(t)
+        self._occupancy.add(t)
+        return t
+
+    def _group_sampler(self, id):
+        # A stream is shared by a block of groups, so a group does not cost a random state of its own.
+        block = id // BLOCK
+        while len(self._samplers) <= block:
+            self._samplers.append(Sampling.stream(self.seed, 'groups', len(self._samplers)))
+        return self._samplers[block]
+
+    def _bury(self, start=0):
+        # Moves the groups that have died from the living groups to the dead ones, and frees their cells. Only the
+        # living groups from start are checked, like the ones created since the last bury.
+        groups = self.living[start:]
+        if self._population is not None:
+            rows = numpy.array([g._index for g in groups], dtype=numpy.int64)
+            dead = self._population.cohorts[rows].sum(axis=1) == 0
+        else:
+            dead = [g.is_dead for g in groups]
+        if numpy.any(dead):
+            living = self.living[:start]
+            for group, is_dead in zip(groups, dead):
+                if is_dead:
+                    self._occupancy.remove(group)
+                    self.dead.append(group)
+                else:
+                    living.append(group)
+            self.living = living
+        self._buried = len(self.living)
+
+    def _update_population(self, groups):
+        if self._population is not None:
+            rows = numpy.array([g._index for g in groups], dtype=numpy.int64)
+            self._population.update(self._world, rows)
+        else:
+            for group in groups:
+                group._update_population(self._world)
+
+    def _apply(self, columns, effects, verbose):
+        # Applies the effects of a vectorized global event to all the groups at once.
+        if effects is None:
+            return
+        affected = numpy.zeros(columns.size, dtype=bool)
+        cohorts = None
+        if effects.cohorts is not None:
+            delta = numpy.asarray(effects.cohorts, dtype=numpy.int64)
+            affected |= delta.any(axis=1)
+            cohorts = numpy.maximum(columns.cohorts + delta, 0)
+        if effects.kill is not None:
+            kill = numpy.asarray(effects.kill, dtype=bool)
+            affected |= kill
+            if cohorts is None:
+                cohorts = columns.cohorts.copy()
+            cohorts[kill] = 0
+        rows = numpy.flatnonzero(affected)
+        if cohorts is not None:
+            columns.assign("cohorts", rows, cohorts[rows])
+        if effects.wealth is not None:
+            delta = numpy.asarray(effects.wealth, dtype=float)
+            changed = numpy.flatnonzero(delta)
+            columns.assign("wealth", changed, columns.wealth[changed] + delta[changed])
+            rows = numpy.union1d(rows, changed)
+        for row in rows:
+            group = columns.groups[row]
+            self.facts.record(group, effects.text.format(name=group.name) if verbose and effects.text else None)
+
+    def information(self):
+        """
+        The information given to the events in the current turn.
+
+        :return: A dictionary with the occupancy, the turn, the living groups, the :class:`Trade.TradeGraph` of the
+                 living groups, the fact buffer and the sampler of the game.
+        """
+        tribes_type = [g.type for g in self.living]
+        return {"occupied_positions": self._occupancy, "turn": self._turn, "tribes-type": tribes_type,
+                "groups": self.living, "trade-graph": TradeGraph(self.living, self._population), "facts": self.facts,
+                "sampler": self.sampler}
 
     def turn(self):
+        with self._phase("publish"):
+            self._publish()
         self._turn += 1
-        occupied_positions = [g.position for g in self.groups]
-        tribes_type = [g.type for g in self.groups]
-        information = {"occupied_positions": occupied_positions, "turn": self._turn, "tribes-type": tribes_type,
-                       "groups": self.groups}
-        for group in self.groups:
-            group.turn(self._world, information)
-        for e in self._global_events:
-            eval(e[0])(self._world, information, e[1])
+        self.facts.turn = self._turn
+        if self.profiler is not None:
+            self.profiler.start_turn(self._turn)
+        with self._phase("occupancy"):
+            # The groups created since the last turn can be dead, like the ones created without population.
+            self._bury(self._buried)
+        with self._phase("trade"):
+            information = self.information()
+        living = self.living
+        with self._phase("population"):
+            self._update_population(living)
+        with self._phase("events"):
+            for group in living:
+                group._check_events(self._world, information)
+        with self._phase("trade"):
+            information["trade-graph"].apply()
+        with self._phase("global-events"):
+            columns = None
+            for event, verbose in self._global_events:
+                if getattr(event, "vectorized", False):
+                    if columns is None:
+                        columns = Columns(living, self._population)
+                    self._apply(columns, event(self._world, columns, information, verbose), verbose)
+                else:
+                    event(self._world, information, verbose)
+                    # The event may have changed the groups behind the columns.
+                    columns = None
+        with self._phase("occupancy"):
+            self._bury()
+        with self._phase("publish"):
+            self._publish()
+        if self.profiler is not None:
+            self.profiler.end_turn()
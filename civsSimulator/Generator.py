@@ -56,6 +56,7 @@ class NameGenerator:
         self._mid = []
         self._sur = []
         self._load_names()
+        self._compile()
 
     def _load_names(self):
         for n in self.syllables:
@@ -66,12 +67,56 @@ class NameGenerator:
             else:
                 self._mid.append(n)
 
-    def compose(self, syls):
+    def _compile(self):
+        """
+        Precompiles the rules of the syllables.
+
+        Every syllable is stored as a (syllable, expecting, ends with vowel, ends with consonant) tuple, where expecting
+        is 1 if the next syllable must start with a vowel, 2 if it must start with a consonant, and 0 otherwise. The
+        middle parts and suffixes are indexed by the (expecting, last) values used in :func:`compose`, so choosing a
+        compatible syllable is a single draw.
+        """
+        self._pre_rules = [self._rules(n) for n in self._pre]
+        self._mid_rules = {}
+        self._sur_rules = {}
+        for expecting in (0, 1, 2):
+            for last in (1, 2):
+                self._mid_rules[expecting, last] = [self._rules(n) for n in self._mid
+                                                    if self._compatible(n, expecting, last)]
+                self._sur_rules[expecting, last] = [self._rules(n) for n in self._sur
+                                                    if self._compatible(n, expecting, last)]
+        self._mid_vowel_first = self._contains_vowel_first(self._mid)
+        self._mid_consonant_first = self._contains_consonant_first(self._mid)
+        self._sur_vowel_first = self._contains_vowel_first(self._sur)
+        self._sur_consonant_first = self._contains_consonant_first(self._sur)
+        self._mid_allow_vowels = self._allow_vowels(self._mid)
+        self._mid_allow_consonants = self._allow_consonants(self._mid)
+        self._sur_allow_vowels = self._allow_vowels(self._sur)
+        self._sur_allow_consonants = self._allow_consonants(self._sur)
+
+    def _rules(self, s):
+        expecting = 0
+        if self._expects_vowel(s):
+            expecting = 1
+        if self._expects_consonant(s):
+            expecting = 2
+        pure = self._pure_syl(s)
+        return pure, expecting, self._vowel_last(pure), self._consonant_last(pure)
+
+    def _compatible(self, s, expecting, last):
+        pure = self._pure_syl(s)
+        return not ((expecting == 1 and not self._vowel_first(pure)) or
+                    (expecting == 2 and not self._consonant_last(pure)) or
+                    (last == 1 and self._hates_previous_vowel(s)) or
+                    (last == 2 and self._hates_previous_consonant(s)))
+
+    def compose(self, syls, random=random):
         """
         Generates a name with the number of given syllables.
 
         If no combination is found an AssertionError is raised
         :param syls: Number of syllables.
+        :param random: The :class:`random.Random` the syllables are drawn from. By default the random module.
         :return: The word generated.
         :raises: AssertionError
         """
@@ -86,105 +131,119 @@ class NameGenerator:
                                  "for a name. (Example: +asd")
         if syls < 1:
             raise AssertionError("Composed words cannot have less than 1 syllable")
-        expecting = 0
-        pre = random.choice(self._pre)
-        last = 1 if self._vowel_last(self._pure_syl(pre)) else 2  # 1 for vowel, 2 for consonant
+        pre, expecting, vowel_last, consonant_last = random.choice(self._pre_rules)
+        last = 1 if vowel_last else 2  # 1 for vowel, 2 for consonant
         if syls > 2:
-            if self._expects_vowel(pre):
-                expecting = 1
-                if not self._contains_vowel_first(self._mid):
-                    raise AssertionError("Expecting middle part stating with vowel, but there is none. "
-                                         "You should add one, or remove requirement for one.. ")
-            if self._expects_consonant(pre):
-                expecting = 2
-                if not self._contains_consonant_first(self._mid):
-                    raise AssertionError("Expecting middle part starting with consonant, but there is none. "
-                                         "You should add one, or remove requirement for one.. ")
+            if expecting == 1 and not self._mid_vowel_first:
+                raise AssertionError("Expecting middle part stating with vowel, but there is none. "
+                                     "You should add one, or remove requirement for one.. ")
+            if expecting == 2 and not self._mid_consonant_first:
+                raise AssertionError("Expecting middle part starting with consonant, but there is none. "
+                                     "You should add one, or remove requirement for one.. ")
         else:
-            if self._expects_vowel(pre):
-                expecting = 1
-                if not self._contains_vowel_first(self._sur):
-                    raise AssertionError("Expecting suffix part starting with vowel, but there is none. "
-                                         "You should add one, or remove requirement for one.. ")
-            if self._expects_consonant(pre):
-                expecting = 2
-                if not self._contains_consonant_first(self._sur):
-                    raise AssertionError("Expecting suffix part starting with consonant, but there is none. "
-                                         "You should add one, or remove requirement for one.. ")
-        if self._vowel_last(self._pure_syl(pre)) and not self._allow_vowels(self._mid):
+            if expecting == 1 and not self._sur_vowel_first:
+                raise AssertionError("Expecting suffix part starting with vowel, but there is none. "
+                                     "You should add one, or remove requirement for one.. ")
+            if expecting == 2 and not self._sur_consonant_first:
+                raise AssertionError("Expecting suffix part starting with consonant, but there is none. "
+                                     "You should add one, or remove requirement for one.. ")
+        if vowel_last and not self._mid_allow_vowels:
             raise AssertionError("Expecting middle part that allows last characters of prefix to be a vowel, "
                                  "but there is none. You should add one, or remove requirements that cannot be "
                                  "fulfilled.. the prefix used was: {}, which means there should be a part available "
                                  "that has -v requirement or no requirements for previous syllables at all.".format(
                                   pre))
-        if self._consonant_last(self._pure_syl(pre)) and not self._allow_consonants(self._mid):
+        if consonant_last and not self._mid_allow_consonants:
             raise AssertionError("Expecting middle part that allows last characters of prefix to be a consonant, "
                                  "but there is none. You should add one, or remove requirements that cannot be "
                                  "fulfilled.. the prefix used was: {}, which means there should be a part available "
                                  "that has -c requirement or no requirements for previous syllables at all.".format(
                                   pre))
-        mid = []
+        mid = [pre]
         for i in range(0, syls - 2):
-            new_mid = random.choice(self._mid)
-            while (expecting == 1 and not self._vowel_first(self._pure_syl(new_mid))) or \
-                    (expecting == 2 and not self._consonant_last(self._pure_syl(new_mid))) or \
-                    (last == 1 and self._hates_previous_vowel(new_mid)) or \
-                    (last == 2 and self._hates_previous_consonant(new_mid)):
-                new_mid = random.choice(self._mid)
-            if self._expects_vowel(new_mid):
+            candidates = self._mid_rules[expecting, last]
+            if not candidates:
+                raise AssertionError("There is no middle part compatible with the previous syllable. You should add "
+                                     "one, or remove requirements that cannot be fulfilled..")
+            new_mid, new_expecting, vowel_last, consonant_last = random.choice(candidates)
+            if new_expecting == 1:
                 expecting = 1
-                if i < syls - 3 and not self._contains_vowel_first(self._mid):
+                if i < syls - 3 and not self._mid_vowel_first:
                     raise AssertionError("Expecting middle part stating with vowel, but there is none. "
                                          "You should add one, or remove requirement for one.. ")
-                if i == syls - 3 and not self._contains_vowel_first(self._sur):
+                if i == syls - 3 and not self._sur_vowel_first:
                     raise AssertionError("Expecting suffix part stating with vowel, but there is none. "
                                          "You should add one, or remove requirement for one.. ")
-            if self._expects_consonant(new_mid):
+            if new_expecting == 2:
                 expecting = 2
-                if i < syls - 3 and not self._contains_consonant_first(self._mid):
+                if i < syls - 3 and not self._mid_consonant_first:
                     raise AssertionError("Expecting middle part starting with consonant, but there is none. "
                                          "You should add one, or remove requirement for one.. ")
-                if i == syls - 3 and not self._contains_consonant_first(self._sur):
+                if i == syls - 3 and not self._sur_consonant_first:
                     raise AssertionError("Expecting suffix part starting with consonant, but there is none. "
                                          "You should add one, or remove requirement for one.. ")
-            if self._vowel_last(self._pure_syl(new_mid)) and not self._allow_vowels(self._mid) and syls > 3:
+            if vowel_last and not self._mid_allow_vowels and syls > 3:
                 raise AssertionError("Expecting middle part that allows last characters of part to be a vowel, "
                                      "but there is none. You should add one, or remove requirements that cannot be "
                                      "fulfilled.. the part used was: {}, which means there should be a part "
                                      "available that has -v requirement or no requirements for previous syllables at"
                                      " all.".format(new_mid))
-            if self._consonant_last(self._pure_syl(new_mid)) and not self._allow_consonants(self._mid) and syls > 3:
+            if consonant_last and not self._mid_allow_consonants and syls > 3:
                 raise AssertionError("Expecting middle part that allows last characters of part to be a consonant, "
                                      "but there is none. You should add one, or remove requirements that cannot be "
                                      "fulfilled.. the part used was: {}, which means there should be a part "
                                      "available that has -c requirement or no requirements for previous syllables at"
                                      " all.".format(new_mid))
             if i == syls - 3:
-                if self._vowel_last(self._pure_syl(new_mid)) and not self._allow_vowels(self._sur):
+                if vowel_last and not self._sur_allow_vowels:
                     raise AssertionError("Expecting suffix part that allows last characters of part to be a vowel, "
                                          "but there is none. You should add one, or remove requirements that cannot be "
                                          "fulfilled.. the part used was: {}, which means there should be a suffix "
                                          "available that has -v requirement or no requirements for previous syllables "
                                          "at all.".format(new_mid))
-                if self._consonant_last(self._pure_syl(new_mid)) and not self._allow_consonants(self._sur):
+                if consonant_last and not self._sur_allow_consonants:
                     raise AssertionError("Expecting suffix part that allows last characters of part to be a consonant, "
                                          "but there is none. You should add one, or remove requirements that cannot be "
                                          "fulfilled.. the part used was: {}, which means there should be a suffix "
                                          "available that has -c requirement or no requirements for previous syllables "
                                          "at all.".format(new_mid))
-            last = 1 if self._vowel_last(self._pure_syl(pre)) else 2
-            mid.append(self._pure_syl(new_mid))
-        sur = random.choice(self._sur)
-        while (expecting == 1 and not self._vowel_first(self._pure_syl(sur))) or \
-                (expecting == 2 and not self._consonant_last(self._pure_syl(sur))) or \
-                (last == 1 and self._hates_previous_vowel(sur)) or \
-                (last == 2 and self._hates_previous_consonant(sur)):
-            sur = random.choice(self._sur)
-        mid.insert(0, self._pure_syl(pre))
+            mid.append(new_mid)
+        candidates = self._sur_rules[expecting, last]
+        if not candidates:
+            raise AssertionError("There is no suffix compatible with the previous syllable. You should add one, or "
+                                 "remove requirements that cannot be fulfilled..")
+        sur = random.choice(candidates)[0]
         if syls > 1:
-            mid.append(self._pure_syl(sur))
+            mid.append(sur)
         return ''.join(mid).capitalize()
 
+    def compose_many(self, n, max_syls, unique=True, random=random):
+        """
+        Generates many names with a random number of syllables between 1 and max_syls.
+
+        :param n: Number of names.
+        :param max_syls: Maximum number of syllables of every name.
+        :param unique: If True all the names will be different.
+        :param random: The :class:`random.Random` the names are drawn from. By default the random module.
+        :return: A list with the words generated.
+        :raises: AssertionError if not enough different names can be generated.
+        """
+        if not unique:
+            return [self.compose(random.randint(1, max_syls), random) for _ in range(n)]
+        names = []
+        found = set()
+        attempts = 20 * n + 100
+        while len(names) < n:
+            if not attempts:
+                raise AssertionError("Cannot generate {} different names with the given syllables, only {} have been "
+                                     "found.".format(n, len(names)))
+            attempts -= 1
+            name = self.compose(random.randint(1, max_syls), random)
+            if name not in found:
+                found.add(name)
+                names.append(name)
+        return names
+
     def _vowel_last(self, s):
         return s[-1:] in self._vowels
 
@@ -240,3 +299,23 @@ class NameGenerator:
             if self._hates_previous_vowel(n) or not self._hates_previous_consonant(n):
                 return True
         return False
+
+
+_generators = {}
+
+
+def get_generator(vowels, consonants, syllables):
+    """
+    Returns a :class:`NameGenerator` for the given rules.
+
+    The generators are cached, so the syllables of a rule set are only compiled once.
+
+    :param vowels: The vowels.
+    :param consonants: The consonants.
+    :param syllables: The syllables with their rules.
+    :return: The name generator.
+    """
+    key = (tuple(vowels), tuple(consonants), tuple(syllables))
+    if key not in _generators:
+        _generators[key] = NameGenerator(list(vowels), list(consonants), list(syllables))
+    return _generators[key]
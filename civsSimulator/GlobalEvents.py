@@ -1,16 +1,16 @@
-import random
-from civsSimulator import Utils
-import math
+from civsSimulator import Sampling
+from civsSimulator.Columns import Effects, vectorized
 
 # ================================================
 # ====     Helper functions for the events    ====
 # ================================================
 
 
-def famine_in_turn():
-    if random.random() < 0.3:
-        if random.random() < 0.3:
-            if random.random() < 0.2:
+def famine_in_turn(sampler=None):
+    sampler = sampler or Sampling.default
+    if sampler.uniform() < 0.3:
+        if sampler.uniform() < 0.3:
+            if sampler.uniform() < 0.2:
                 return True
     return False
 
@@ -20,14 +20,7 @@ def famine_in_turn():
 # =======================
 
 
-def famine(world, information, verbose):
-    if famine_in_turn():
-        for g in information["groups"]:
-            if g.prosperity < 0.4 and not g.is_dead:
-                g.kill()
-                fact = "{} has dead of famine".format(g.name)
-                if verbose:
-                    if information["turn"] in g.facts:
-                        g.facts[information["turn"]].append(fact)
-                    else:
-                        g.facts[information["turn"]] = [fact]
+@vectorized
+def famine(world, columns, information, verbose):
+    if famine_in_turn(information.get("sampler")):
+        return Effects(kill=(columns.prosperity < 0.4) & (columns.population > 0), text="{name} has dead of famine")
@@ -1,8 +1,6 @@
-import random
-import copy
 import math
-from civsSimulator import Utils, Events
-from civsSimulator.Tribes import *
+import numpy
+from civsSimulator import Utils, Sampling
 
 
 class Group:
@@ -11,10 +9,9 @@ class Group:
     The group will evolve using the :func:`turn`.
 
     :param position: The position to set the group.
-    :param tribe: A dictionary containing all the custom parameters for the group.
-    :param default: A dictionary containing all the default parameters for all the groups.
+    :param tribe: The :class:`TribeConfig.TribeConfig` of the group, shared with all the groups of the tribe.
 
-    The tribe parameters will be merged with the default ones.
+    The tribe configuration merges the tribe parameters with the default ones.
 
     The current available parameters are:
         * **Biomes-prosperity-per-activity**: this entry holds the prosperity factor of every biome that defines the
@@ -31,54 +28,55 @@ class Group:
         * **Grown-rates**: this defines the values to grown the people, the **men-women** is the relation of a child
           growing men or women (1.0 all men, 0.0 all women), the **old-men** and **old-women** are the probability of
           a young to grown old.
-        * **Events**: this is a list of all the events a tribe will check every turn. The values are the function names
-          of the events in the Events module. They are executed with the **group** and **world** as parameters.
+        * **Events**: this is a list of all the events a tribe will check every turn. The values are the dotted names
+          of the event functions resolved by the :mod:`Registry`. They are executed with the **group** and **world**
+          as parameters.
         * **Migration-radius**: this is the radius a tribe will check for a better position if the event migrate
           triggers.
         * **Migration-rate**: this is a list with the probability of migrate depending the current tribe culture.
 
     """
-    def __init__(self, position, tribe, default, id):
+    def __init__(self, position, tribe, id, name=None, sampler=None):
         """
         This will create a group in the given position, and with the given parameters.
 
-        The tribe parameters will be merged with the default ones.
+        The parameters are referenced from the tribe configuration, not copied. The activities are copied when the
+        group adds a new one.
 
         :param position: The position to set the group.
-        :param tribe: A dictionary containing all the custom parameters for the group.
-        :param default: A dictionary containing all the default parameters for all the groups.
+        :param tribe: The :class:`TribeConfig.TribeConfig` of the group.
+        :param id: The identifier of the group.
+        :param name: The name of the group. If None a name is generated with the name function of the tribe.
+        :param sampler: The :class:`Sampling.Sampler` of the random stream of the group, used by its population update
+                        and its events. It can be shared with other groups. If None the default sampler is used.
         """
         self._position = position
         self.id = id
-        mix_tribe = copy.deepcopy(tribe)
-        def_tribe = copy.deepcopy(default)
-        mix_tribe = Utils.update(mix_tribe, def_tribe)
-        self._tribe = mix_tribe
-        self.name = eval(mix_tribe["Name"])(mix_tribe["Name-rules"])
-        self.type = mix_tribe["Type"]
-        self._children = random.randrange(0, mix_tribe["Max-initial-population"]["children"])
-        self._young_men = random.randrange(0, mix_tribe["Max-initial-population"]["young-men"])
-        self._young_women = random.randrange(0, mix_tribe["Max-initial-population"]["young-women"])
-        self._old_men = random.randrange(0, mix_tribe["Max-initial-population"]["old-men"])
-        self._old_women = random.randrange(0, mix_tribe["Max-initial-population"]["old-women"])
-        self.activities = mix_tribe["Start-activities"]
-        self._max_populations = mix_tribe["Max-population-for-activity"]
-        self._biomes_prosperity_per_activity = mix_tribe["Biomes-prosperity-per-activity"]
-        self._crowding_per_activity = mix_tribe["Crowding-for-activity"]
-        self._mortality = mix_tribe["Mortality-rates"]
-        self._grown_rates = mix_tribe["Grown-rates"]
+        self._tribe = tribe
+        self.name = name if name is not None else tribe.name_function(tribe["Name-rules"])
+        self.type = tribe.type
+        self.sampler = sampler or Sampling.default
+        self._children = self.sampler.randrange(0, tribe["Max-initial-population"]["children"])
+        self._young_men = self.sampler.randrange(0, tribe["Max-initial-population"]["young-men"])
+        self._young_women = self.sampler.randrange(0, tribe["Max-initial-population"]["young-women"])
+        self._old_men = self.sampler.randrange(0, tribe["Max-initial-population"]["old-men"])
+        self._old_women = self.sampler.randrange(0, tribe["Max-initial-population"]["old-women"])
+        self.activities = tribe["Start-activities"]
+        self._max_populations = tribe["Max-population-for-activity"]
+        self._crowding_per_activity = tribe["Crowding-for-activity"]
+        self._mortality = tribe["Mortality-rates"]
+        self._grown_rates = tribe["Grown-rates"]
         self._last_prosperity = 0
         self.nomadism = "nomadic"
-        self._events = mix_tribe["Events"]
-        self._migration_radius = mix_tribe["Migration-radius"]
-        self._migration_rate = mix_tribe["Migration-rate"]
-        self.facts = {}
-        self.file_facts = {}
+        self._events = tribe.events
+        self._migration_radius = tribe["Migration-radius"]
+        self._migration_rate = tribe["Migration-rate"]
         self._wealth = 0
-        self._wealth_base_multiplier = mix_tribe["Wealth-base-multiplier"]
-        self._trade_radius = mix_tribe["Trade-base-radius"]
+        self._wealth_base_multiplier = tribe["Wealth-base-multiplier"]
+        self._trade_radius = tribe["Trade-base-radius"]
         self.knows_trade = False
-        self.file_facts[0] = {'pos': self._position, 'nomadism': 'nomadic'}
+        self._multiplier_wealth = None
+        self._multiplier = None
 
     def print_population_info(self):
         """
@@ -154,11 +152,17 @@ class Group:
 
         -7.5498*10^-10 * x^3 + 1.47482*10^-6 * x^2 + 0.000268934 * x + 0.998994
 
+        The value is only computed again when the wealth changes.
+
         :return: The wealth multiplier.
         """
-        return self._wealth_base_multiplier * (-7.5498 * math.pow(10, -10) * math.pow(self._wealth, 3) + 1.47482 *
-                                               math.pow(10, -6) * math.pow(self._wealth, 2) + 0.000268934 *
-                                               self._wealth + 0.998994)
+        wealth = self._wealth
+        if wealth != self._multiplier_wealth:
+            self._multiplier_wealth = wealth
+            self._multiplier = self._wealth_base_multiplier * (-7.5498 * math.pow(10, -10) * math.pow(wealth, 3) +
+                                                               1.47482 * math.pow(10, -6) * math.pow(wealth, 2) +
+                                                               0.000268934 * wealth + 0.998994)
+        return self._multiplier
 
     @property
     def trade_radius(self):
@@ -184,8 +188,8 @@ class Group:
         :param world: The world in which the group lives.
         :param information: A dictionary with the information to give to the events.
         """
-        for event in self._events:
-            eval(event[0])(self, world, information, event[1])
+        for event, verbose in self._events:
+            event(self, world, information, verbose)
 
     def _update_population(self, world):
         """
@@ -232,15 +236,33 @@ class Group:
             prosperity.append(Utils.saturate(base * crowding, 1.0))
         return prosperity
 
+    def get_prosperity_area(self, world, x0, y0, x1, y1):
+        """
+        This function returns the prosperity of the group in every cell of a rectangle of the world.
+
+        :param world: The :class:`Map.Map` in which the group lives.
+        :param x0: The first column of the rectangle.
+        :param y0: The first row of the rectangle.
+        :param x1: The column after the last one of the rectangle.
+        :param y1: The row after the last one of the rectangle.
+        :return: An array with the prosperity of every cell, indexed as [y, x].
+        """
+        prosperity = [numpy.clip(self._tribe.prosperity[activity][y0:y1, x0:x1] *
+                                 self._get_crowding_per_activity(activity), 0.0, 1.0) for activity in self.activities]
+        return numpy.max(prosperity, axis=0)
+
     def get_base_prosperity_per_activity(self, activity, world, position):
         """
         This functions returns the prosperity of an activity given a position.
+
+        The value is read from the rasters of the tribe of the group, built by its game on its world.
+
         :param activity: The activity to get the prosperity.
-        :param world: The world in which the group lives.
+        :param world: The :class:`Map.Map` in which the group lives.
         :param position: The position to check.
         :return: The prosperity in that position with the given activity.
         """
-        return self._biomes_prosperity_per_activity[activity][world.biome_at(position).name()]
+        return self._tribe.prosperity[activity][position[1], position[0]]
 
     def _get_crowding_per_activity(self, activity):
         actives = self.active_persons
@@ -259,8 +281,8 @@ class Group:
     def _update_children(self, prosp):
         mortality = self._mortality["children"] * Utils.opposite(prosp)
         n_children = self._children
-        [dead, grown] = Utils.rsplit(n_children, mortality)
-        [men, women] = Utils.rsplit(grown, self._grown_rates["men-women"])
+        [dead, grown] = Utils.rsplit(n_children, mortality, self.sampler)
+        [men, women] = Utils.rsplit(grown, self._grown_rates["men-women"], self.sampler)
         # print("Dead children: " + str(dead))
         return [-dead, men, women, 0, 0]
 
@@ -269,10 +291,10 @@ class Group:
         mortality_women = self._mortality["young-women"] * Utils.opposite(prosp)
         n_young_men = self._young_men
         n_young_women = self._young_women
-        [m_dead, m_alive] = Utils.rsplit(n_young_men, mortality_men)
-        [w_dead, w_alive] = Utils.rsplit(n_young_women, mortality_women)
-        [m_grown, m_rest] = Utils.rsplit(m_alive, self._grown_rates["old-men"])
-        [w_grown, w_rest] = Utils.rsplit(w_alive, self._grown_rates["old-women"])
+        [m_dead, m_alive] = Utils.rsplit(n_young_men, mortality_men, self.sampler)
+        [w_dead, w_alive] = Utils.rsplit(n_young_women, mortality_women, self.sampler)
+        [m_grown, m_rest] = Utils.rsplit(m_alive, self._grown_rates["old-men"], self.sampler)
+        [w_grown, w_rest] = Utils.rsplit(w_alive, self._grown_rates["old-women"], self.sampler)
         # print("Dead young men: " + str(m_dead) + " dead young women: " + str(w_dead))
         return [0, -1 * (m_dead + m_grown), -1 * (w_dead + w_grown), m_grown, w_grown]
 
@@ -281,8 +303,8 @@ class Group:
         mortality_women = Utils.saturate(self._mortality["old-women"] * Utils.opposite(prosp), 1.0)
         n_old_men = self._old_men
         n_old_women = self._old_women
-        [m_dead, m_alive] = Utils.rsplit(n_old_men, mortality_men)
-        [w_dead, w_alive] = Utils.rsplit(n_old_women, mortality_women)
+        [m_dead, m_alive] = Utils.rsplit(n_old_men, mortality_men, self.sampler)
+        [w_dead, w_alive] = Utils.rsplit(n_old_women, mortality_women, self.sampler)
         # print("Dead old men: " + str(m_dead) + " dead old women: " + str(w_dead))
         return [0, 0, 0, -m_dead, -w_dead]
 
@@ -290,10 +312,19 @@ class Group:
         n_young_men = self._young_men
         n_young_women = self._young_women
         men_availability_factor = self._get_men_availability_factor(n_young_men, n_young_women)
-        women_fertility = n_young_women * self._grown_rates["women-fertility"] * Utils.perturbate_high(prosp)
+        women_fertility = n_young_women * self._grown_rates["women-fertility"] * Utils.perturbate_high(prosp,
+                                                                                                       self.sampler)
         births = round(women_fertility * men_availability_factor)
         return [births, 0, 0, 0, 0]
 
+    def add_activity(self, activity):
+        """
+        Adds a new activity to the group.
+
+        :param activity: The name of the activity.
+        """
+        self.activities = tuple(self.activities) + (activity,)
+
     def trade(self, prosp):
         if prosp > self.prosperity:
             self._wealth += 5
@@ -0,0 +1,92 @@
+import numpy
+
+
+class Map:
+    """This class represents a world with its biomes precomputed as arrays.
+
+    When created the biome of every cell is converted to an index into :attr:`biomes`, so the events and the groups
+    can look up biomes and prosperities with array indexing instead of calling the world.
+
+    :param world: The world to wrap. It must have a **width**, a **height** and a **biome_at** function returning an
+                  object with a **name** function. If it has the **biomes** names and a **biome_index** array, like a
+                  :class:`Worlds.ArrayWorld`, they are used as they are, and so is its **land** mask if it has one.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.width = world.width
+        self.height = world.height
+        self.biomes, self.biome_index = self._load_biomes(world)
+        if isinstance(getattr(world, "land", None), numpy.ndarray):
+            self.land = world.land
+        elif "ocean" in self.biomes:
+            self.land = self.biome_index != self.biomes.index("ocean")
+        else:
+            self.land = numpy.ones(self.biome_index.shape, dtype=bool)
+        self._prosperity = {}
+        self._habitable = {}
+
+    @staticmethod
+    def _load_biomes(world):
+        if hasattr(world, "biomes") and isinstance(getattr(world, "biome_index", None), numpy.ndarray):
+            return list(world.biomes), world.biome_index
+        if hasattr(world, "layers") and "biome" in world.layers:
+            names = numpy.asarray(world.layers["biome"].data)
+        elif isinstance(getattr(world, "biome", None), numpy.ndarray):
+            names = world.biome
+        else:
+            names = numpy.array([[world.biome_at((x, y)).name() for x in range(world.width)]
+                                 for y in range(world.height)], dtype=object)
+        biomes, index = numpy.unique(names.astype(str), return_inverse=True)
+        return [str(b) for b in biomes], index.reshape(names.shape).astype(numpy.int32)
+
+    def biome_at(self, pos):
+        """
+        The biome at the given position of the wrapped world.
+        """
+        return self.world.biome_at(pos)
+
+    def biome_name(self, pos):
+        """
+        The name of the biome at the given position.
+        """
+        return self.biomes[self.biome_index[pos[1], pos[0]]]
+
+    def is_land(self, pos):
+        """
+        True if the given position is not ocean, False otherwise.
+        """
+        return self.land[pos[1], pos[0]]
+
+    def habitable_cells(self, unhospitable_biomes):
+        """
+        The cells of the world that are not of the given biomes.
+
+        The result is cached for every distinct set of biomes.
+
+        :param unhospitable_biomes: The names of the biomes to skip.
+        :return: An array with the flat index (y * width + x) of every habitable cell.
+        """
+        key = frozenset(unhospitable_biomes)
+        if key not in self._habitable:
+            skip = numpy.array([b in key for b in self.biomes], dtype=bool)
+            self._habitable[key] = numpy.flatnonzero(~skip[self.biome_index])
+        return self._habitable[key]
+
+    def prosperity(self, biomes_prosperity):
+        """
+        The prosperity raster of an activity.
+
+        The rasters are cached by the prosperity of the biomes of the world, not by tribe, so the games that share the
+        map share the rasters of the same tables and can not change the rasters of another game. The rasters are read
+        only.
+
+        :param biomes_prosperity: A dictionary with the prosperity of every biome.
+        :return: An array with the base prosperity of every cell, indexed as [y, x].
+        :raises: KeyError if a biome of the world has no prosperity.
+        """
+        values = tuple(float(biomes_prosperity[b]) for b in self.biomes)
+        if values not in self._prosperity:
+            raster = numpy.array(values)[self.biome_index]
+            raster.flags.writeable = False
+            self._prosperity[values] = raster
+        return self._prosperity[values]
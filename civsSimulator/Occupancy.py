@@ -0,0 +1,66 @@
+import numpy
+
+
+class Occupancy:
+    """This class represents an index of the living groups by their position.
+
+    The index keeps the number of groups in every cell of the world in :attr:`grid`, and the groups of every occupied
+    cell in a dictionary, so the queries around a position only visit the cells of the neighbourhood.
+
+    The index has to be updated with :func:`move` when a group changes its position and with :func:`remove` when a
+    group dies.
+
+    :param width: The width of the world.
+    :param height: The height of the world.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.grid = numpy.zeros((height, width), dtype=numpy.int32)
+        self._cells = {}
+
+    def __contains__(self, pos):
+        return pos in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def add(self, group):
+        """
+        Adds a group to the index in its current position.
+
+        :param group: The group to add.
+        """
+        pos = group.position
+        self._cells.setdefault(pos, []).append(group)
+        self.grid[pos[1], pos[0]] += 1
+
+    def remove(self, group):
+        """
+        Removes a group from the index.
+
+        :param group: The group to remove.
+        """
+        pos = group.position
+        cell = self._cells[pos]
+        cell.remove(group)
+        if not cell:
+            del self._cells[pos]
+        self.grid[pos[1], pos[0]] -= 1
+
+    def move(self, group, position):
+        """
+        Moves a group to a new position, updating the index.
+
+        :param group: The group to move.
+        :param position: The new position of the group.
+        """
+        self.remove(group)
+        group.position = position
+        self.add(group)
+
+    def groups_at(self, pos):
+        """
+        The groups in the given position.
+        """
+        return self._cells.get(tuple(pos), [])
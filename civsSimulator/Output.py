@@ -0,0 +1,175 @@
+import json
+import queue
+import threading
+from civsSimulator import Facts
+
+
+def print_facts(turn, facts):
+    """
+    Prints the descriptions of the facts of a turn.
+
+    :param turn: The turn.
+    :param facts: A list of :class:`Facts.Fact`.
+    """
+    texts = Facts.texts(facts)
+    if texts:
+        print("========================================")
+        print("=========      In turn {}      =========".format(turn))
+        print("========================================")
+        for x in texts:
+            print(x)
+
+
+class JSONWriter:
+    """This class represents a writer of the facts of a simulation as a single JSON list.
+
+    The facts are kept in memory and written when the writer is closed. The list has an entry for every turn, with the
+    list of facts of the turn, or an empty dictionary if nothing happened.
+
+    :param path: The file to write.
+    """
+    def __init__(self, path):
+        self._path = path
+        self._facts = []
+
+    def write(self, turn, facts):
+        """
+        Adds the facts of a turn.
+
+        :param turn: The turn.
+        :param facts: A list with the facts of the turn.
+        """
+        while len(self._facts) <= turn:
+            self._facts.append({})
+        if facts:
+            self._facts[turn] = (self._facts[turn] or []) + facts
+
+    def close(self):
+        """
+        Writes the facts to the file.
+        """
+        with open(self._path, 'w') as f:
+            json.dump(self._facts, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NDJSONWriter:
+    """This class represents a writer of the facts of a simulation as newline delimited JSON.
+
+    Every call to :func:`write` appends a line with the facts of a turn and flushes the file, so the file can be read
+    while the simulation runs and the facts do not need to be kept in memory.
+
+    :param path: The file to write.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'w')
+
+    def write(self, turn, facts):
+        """
+        Writes the facts of a turn.
+
+        :param turn: The turn.
+        :param facts: A list with the facts of the turn.
+        """
+        self._file.write(json.dumps({'turn': turn, 'facts': facts}))
+        self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BackgroundWriter:
+    """This class represents the output of a simulation written by a thread of its own.
+
+    It is subscribed to a :class:`Game.Game` with :func:`Game.Game.subscribe`, and the facts of every finished turn are
+    put in a queue. A thread takes them in order, prints their descriptions if verbose and writes them with the writer,
+    so the turns do not wait for the terminal nor the disk. The queue is bounded, so if the output is slower than the
+    simulation the game waits when the queue is full instead of keeping all the facts in memory.
+
+    :func:`close` waits until all the facts are written and closes the writer from the thread. If a turn can not be
+    written the later turns are dropped and the writer is not closed, so an incomplete output is never finished as a
+    complete one. The error is raised by every later call to the writer, and by :func:`close` if it has not been
+    raised before.
+
+    :param writer: The writer of the facts, like a :class:`JSONWriter` or a :class:`NDJSONWriter`.
+    :param verbose: If True the descriptions of the facts are printed with :func:`print_facts`.
+    :param size: The number of turns that can wait in the queue.
+    """
+    def __init__(self, writer, verbose=False, size=64):
+        self._writer = writer
+        self._verbose = verbose
+        self._queue = queue.Queue(size)
+        self._error = None
+        self._reported = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="civsSimulator-output", daemon=True)
+        self._thread.start()
+
+    def __call__(self, turn, facts):
+        """
+        Queues the facts of a turn, waiting if the queue is full.
+
+        :param turn: The turn.
+        :param facts: A list of :class:`Facts.Fact`.
+        :raises: ValueError if the writer has been closed, or the error of the thread if a turn could not be written.
+        """
+        if self._closed:
+            raise ValueError("The facts of turn {} have been written after closing the output.".format(turn))
+        if self._error is not None:
+            self._reported = True
+            raise self._error
+        self._queue.put((turn, facts))
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            if self._error is not None:
+                # The batches are still taken after an error, so the game never waits for a full queue.
+                continue
+            try:
+                turn, facts = batch
+                if self._verbose:
+                    print_facts(turn, facts)
+                self._writer.write(turn, Facts.file_facts(facts))
+            except Exception as err:
+                self._error = err
+        if self._error is None:
+            try:
+                self._writer.close()
+            except Exception as err:
+                self._error = err
+
+    def close(self):
+        """
+        Writes the queued facts and closes the writer.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None and not self._reported:
+            self._reported = True
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
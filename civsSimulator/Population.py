@@ -0,0 +1,264 @@
+import numpy
+from civsSimulator import Utils, Sampling
+from civsSimulator.Group import Group
+
+COHORTS = ["children", "young-men", "young-women", "old-men", "old-women"]
+NOMADISM = ["nomadic", "semi-sedentary", "sedentary"]
+GROWN_RATES = ["men-women", "old-men", "old-women", "women-fertility"]
+
+
+class Population:
+    """This class represents the population of all the groups of a game stored as a structure of arrays.
+
+    Every group is a row in the arrays, and the population of all the living groups is updated at once with
+    :func:`update`. The groups are :class:`GroupView` objects that read and write their state from the arrays.
+
+    The rows are updated in blocks of **block** rows, and every block draws from its own random stream derived from
+    the seed.
+
+    :param activities: The names of all the activities the groups can have.
+    :param capacity: The initial number of rows of the arrays.
+    :param seed: The master seed of the random streams of the blocks, see :func:`Sampling.stream`.
+    :param block: The number of rows of a block.
+    """
+    def __init__(self, activities, capacity=1024, seed=None, block=256):
+        self.activities = list(activities)
+        self.seed = seed
+        self.block = block
+        self.samplers = []
+        self._activity_index = {a: i for i, a in enumerate(self.activities)}
+        self.size = 0
+        self.groups = []
+        self.types = []
+        self._rasters = []
+        self.cohorts = numpy.zeros((capacity, len(COHORTS)), dtype=numpy.int64)
+        self.wealth = numpy.zeros(capacity)
+        self.prosperity = numpy.zeros(capacity)
+        self.nomadism = numpy.zeros(capacity, dtype=numpy.int8)
+        self.type = numpy.zeros(capacity, dtype=numpy.int32)
+        self.x = numpy.zeros(capacity, dtype=numpy.int64)
+        self.y = numpy.zeros(capacity, dtype=numpy.int64)
+        self.has_activity = numpy.zeros((capacity, len(self.activities)), dtype=bool)
+        self.mortality = numpy.zeros((capacity, len(COHORTS)))
+        self.grown_rates = numpy.zeros((capacity, len(GROWN_RATES)))
+        self.max_population = numpy.zeros((capacity, len(self.activities)))
+        self.crowding = numpy.zeros((capacity, len(self.activities)))
+        self.wealth_base_multiplier = numpy.zeros(capacity)
+
+    _columns = ["cohorts", "wealth", "prosperity", "nomadism", "type", "x", "y", "has_activity", "mortality",
+                "grown_rates", "max_population", "crowding", "wealth_base_multiplier"]
+
+    def activity_index(self, activity):
+        """
+        The column of the given activity.
+
+        :param activity: The name of the activity.
+        """
+        return self._activity_index[activity]
+
+    def add(self):
+        """
+        Adds a new empty row to the arrays.
+
+        :return: The index of the new row.
+        """
+        if self.size == len(self.wealth):
+            self._grow(2 * self.size)
+        if self.size % self.block == 0:
+            self.samplers.append(Sampling.stream(self.seed, 'population', len(self.samplers)))
+        self.size += 1
+        return self.size - 1
+
+    def _grow(self, capacity):
+        for name in self._columns:
+            old = getattr(self, name)
+            new = numpy.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def bind(self, index, group):
+        """
+        Copies the parameters of a group into its row.
+
+        :param index: The row of the group.
+        :param group: The group.
+        """
+        self.groups.append(group)
+        if group.type not in self.types:
+            self.types.append(group.type)
+            self._rasters.append(group._tribe.prosperity)
+        self.type[index] = self.types.index(group.type)
+        self.mortality[index] = [group._mortality[c] for c in COHORTS]
+        self.grown_rates[index] = [group._grown_rates[r] for r in GROWN_RATES]
+        for activity, i in self._activity_index.items():
+            self.max_population[index, i] = group._max_populations.get(activity, 0)
+            self.crowding[index, i] = group._crowding_per_activity.get(activity, 0)
+        self.wealth_base_multiplier[index] = group._wealth_base_multiplier
+
+    def wealth_multiplier(self, rows):
+        """
+        The wealth multiplier of the given rows, see :attr:`Group.wealth_multiplier`.
+
+        :param rows: The rows to compute.
+        """
+        w = self.wealth[rows]
+        return self.wealth_base_multiplier[rows] * (-7.5498e-10 * w ** 3 + 1.47482e-6 * w ** 2 + 0.000268934 * w +
+                                                    0.998994)
+
+    def base_prosperity(self, world, rows):
+        """
+        The base prosperity of every activity of the given rows.
+
+        :param world: The :class:`Map.Map` in which the groups live.
+        :param rows: The rows to compute.
+        :return: An array with a row per group and a column per activity.
+        """
+        base = numpy.zeros((len(rows), len(self.activities)))
+        x = self.x[rows]
+        y = self.y[rows]
+        types = self.type[rows]
+        for t, rasters in enumerate(self._rasters):
+            of_type = types == t
+            if not of_type.any():
+                continue
+            for activity, a in self._activity_index.items():
+                if activity in rasters:
+                    base[of_type, a] = rasters[activity][y[of_type], x[of_type]]
+        return base
+
+    def get_prosperity(self, world, rows):
+        """
+        The prosperity of the given rows, see :func:`Group.get_prosperity`.
+
+        :param world: The world in which the groups live.
+        :param rows: The rows to compute.
+        """
+        cohorts = self.cohorts[rows]
+        total = cohorts.sum(axis=1)[:, None].astype(float)
+        actives = (cohorts[:, 1] + cohorts[:, 2])[:, None]
+        multiplier = self.wealth_multiplier(rows)
+        max_support = self.max_population[rows] * multiplier[:, None]
+        pop_support = numpy.minimum(max_support, actives * self.crowding[rows])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            crowding = numpy.where(total < pop_support, 1.0,
+                                   numpy.where((pop_support == 0) | (total == 0), 0.0, pop_support / total))
+        prosperity = numpy.clip(self.base_prosperity(world, rows) * crowding, 0.0, 1.0)
+        prosperity[~self.has_activity[rows]] = -numpy.inf
+        return prosperity.max(axis=1)
+
+    def update(self, world, rows):
+        """
+        Updates the population of all the living groups, see :func:`Group._update_population`.
+
+        The children, young, old and births deltas are computed from the population at the start of the update, as
+        done by every group.
+
+        :param world: The world in which the groups live.
+        :param rows: The sorted rows of the living groups.
+        """
+        blocks = numpy.split(rows, numpy.flatnonzero(numpy.diff(rows // self.block)) + 1) if len(rows) else []
+        for block in blocks:
+            self._update_block(world, block)
+
+    def _update_block(self, world, rows):
+        sampler = self.samplers[rows[0] // self.block]
+        p = self.get_prosperity(world, rows) * self.wealth_multiplier(rows)
+        self.prosperity[rows] = p
+        q = 1.0 - p
+        cohorts = self.cohorts[rows]
+        mortality = self.mortality[rows]
+        grown = self.grown_rates[rows]
+        children, young_men, young_women, old_men, old_women = cohorts.T
+
+        children_dead, children_grown = sampler.split_many(children, mortality[:, 0] * q)
+        men, women = sampler.split_many(children_grown, grown[:, 0])
+        men_dead, men_alive = sampler.split_many(young_men, mortality[:, 1] * q)
+        women_dead, women_alive = sampler.split_many(young_women, mortality[:, 2] * q)
+        men_grown, _ = sampler.split_many(men_alive, grown[:, 1])
+        women_grown, _ = sampler.split_many(women_alive, grown[:, 2])
+        old_men_dead, _ = sampler.split_many(old_men, mortality[:, 3] * q)
+        old_women_dead, _ = sampler.split_many(old_women, mortality[:, 4] * q)
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            men_factor = numpy.where(young_women > 0, young_men / young_women, 0.0)
+        availability = numpy.clip(men_factor * 0.25, 0.0, 1.0)
+        fertility = young_women * grown[:, 3] * numpy.minimum(numpy.maximum(p + sampler.uniform(len(rows)) - 0.5,
+                                                                            0.0), 1.0)
+        births = numpy.rint(fertility * availability).astype(numpy.int64)
+
+        cohorts[:, 0] += births - children_dead
+        cohorts[:, 1] += men - men_dead - men_grown
+        cohorts[:, 2] += women - women_dead - women_grown
+        cohorts[:, 3] += men_grown - old_men_dead
+        cohorts[:, 4] += women_grown - old_women_dead
+        self.cohorts[rows] = cohorts
+
+
+def _column(name, column=None, convert=int):
+    def fget(self):
+        values = getattr(self._population, name)
+        return convert(values[self._index] if column is None else values[self._index, column])
+
+    def fset(self, value):
+        values = getattr(self._population, name)
+        if column is None:
+            values[self._index] = value
+        else:
+            values[self._index, column] = value
+    return property(fget, fset)
+
+
+class GroupView(Group):
+    """This class represents a group whose state is stored in a :class:`Population`.
+
+    It behaves as a :class:`Group`, but the population, wealth, prosperity, culture, position and activities are
+    rows of the population arrays, so all the groups can be updated at once.
+
+    :param population: The population that stores the group.
+    """
+    def __init__(self, population, position, tribe, id, name=None, sampler=None):
+        self._population = population
+        self._index = population.add()
+        Group.__init__(self, position, tribe, id, name, sampler)
+        population.bind(self._index, self)
+
+    _children = _column("cohorts", 0)
+    _young_men = _column("cohorts", 1)
+    _young_women = _column("cohorts", 2)
+    _old_men = _column("cohorts", 3)
+    _old_women = _column("cohorts", 4)
+    _wealth = _column("wealth", convert=float)
+    _last_prosperity = _column("prosperity", convert=float)
+
+    @property
+    def nomadism(self):
+        return NOMADISM[self._population.nomadism[self._index]]
+
+    @nomadism.setter
+    def nomadism(self, value):
+        self._population.nomadism[self._index] = NOMADISM.index(value)
+
+    @property
+    def _position(self):
+        return self._cached_position
+
+    @_position.setter
+    def _position(self, value):
+        self._cached_position = Utils.Position._make(value)
+        self._population.x[self._index] = value[0]
+        self._population.y[self._index] = value[1]
+
+    @property
+    def activities(self):
+        mask = self._population.has_activity[self._index]
+        return [a for a, has in zip(self._population.activities, mask) if has]
+
+    @activities.setter
+    def activities(self, value):
+        mask = self._population.has_activity[self._index]
+        mask[:] = False
+        for activity in value:
+            mask[self._population.activity_index(activity)] = True
+
+    def add_activity(self, activity):
+        self._population.has_activity[self._index, self._population.activity_index(activity)] = True
@@ -0,0 +1,146 @@
+import json
+import time
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler.add(self._name, time.perf_counter() - self._start)
+
+
+class _Disabled:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+DISABLED = _Disabled()
+
+
+class Profiler:
+    """This class represents the instrumentation of a game.
+
+    It records the number of calls, the wall time and the number of triggers of every event function and of every
+    phase of a turn, like **population** or **events**. An event triggers when it records a fact, even if the fact is
+    not printed nor saved, or when a vectorized global event returns effects. The time of every phase and every event
+    is also kept for every turn.
+
+    A game is only instrumented after :func:`Game.Game.profile`, so a game without profiler has no overhead.
+
+    :param facts: The :class:`Facts.FactBuffer` of the game, used to detect the triggers.
+    """
+    def __init__(self, facts):
+        self._facts = facts
+        self.stats = {}
+        self.turns = []
+        self._turn = None
+
+    def _stat(self, name):
+        if name not in self.stats:
+            self.stats[name] = [0, 0.0, 0]
+        return self.stats[name]
+
+    def add(self, name, seconds):
+        """
+        Adds a call of a phase.
+
+        :param name: The name of the phase.
+        :param seconds: The wall time of the call.
+        """
+        stat = self._stat(name)
+        stat[0] += 1
+        stat[1] += seconds
+        if self._turn is not None:
+            self._turn[name] = self._turn.get(name, 0.0) + seconds
+
+    def phase(self, name):
+        """
+        A context manager that times a phase, see :func:`add`.
+
+        :param name: The name of the phase.
+        """
+        return _Phase(self, name)
+
+    def wrap(self, events):
+        """
+        Instruments the events of a tribe or the global events.
+
+        :param events: A tuple of (function, verbose) tuples, like :attr:`TribeConfig.TribeConfig.events`.
+        :return: A tuple with the same events, whose functions record their calls, time and triggers.
+        """
+        return tuple((self._wrap(function), verbose) for function, verbose in events)
+
+    def _wrap(self, function):
+        if getattr(function, "profiled", False):
+            return function
+        name = "{}.{}".format(function.__module__.rpartition('.')[2], function.__name__)
+        stat = self._stat(name)
+        facts = self._facts
+
+        def profiled(*args):
+            recorded = facts.recorded
+            start = time.perf_counter()
+            result = function(*args)
+            seconds = time.perf_counter() - start
+            stat[0] += 1
+            stat[1] += seconds
+            if facts.recorded != recorded or result is not None:
+                stat[2] += 1
+            if self._turn is not None:
+                self._turn[name] = self._turn.get(name, 0.0) + seconds
+            return result
+        profiled.profiled = True
+        profiled.vectorized = getattr(function, "vectorized", False)
+        return profiled
+
+    def start_turn(self, turn):
+        """
+        Starts the timings of a turn.
+
+        :param turn: The turn.
+        """
+        self._turn = {'turn': turn}
+        self.turns.append(self._turn)
+
+    def end_turn(self):
+        """
+        Ends the timings of the current turn.
+        """
+        self._turn = None
+
+    def summary(self):
+        """
+        The recorded statistics, sorted by the time spent.
+
+        :return: A list with a (name, calls, triggers, seconds) tuple for every event and phase.
+        """
+        rows = [(name, calls, triggers, seconds) for name, (calls, seconds, triggers) in self.stats.items()]
+        return sorted(rows, key=lambda row: -row[3])
+
+    def print_summary(self):
+        """
+        Prints the recorded statistics as a table.
+        """
+        print("{:<32} {:>10} {:>10} {:>12} {:>12}".format("Name", "Calls", "Triggers", "Total (s)", "Mean (us)"))
+        for name, calls, triggers, seconds in self.summary():
+            print("{:<32} {:>10} {:>10} {:>12.4f} {:>12.2f}".format(name, calls, triggers, seconds,
+                                                                     1e6 * seconds / calls if calls else 0.0))
+
+    def dump(self, path):
+        """
+        Writes the timings of every turn as newline delimited JSON.
+
+        :param path: The file to write.
+        """
+        with open(path, 'w') as f:
+            for timings in self.turns:
+                f.write(json.dumps(timings))
+                f.write('\n')
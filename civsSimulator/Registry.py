@@ -0,0 +1,119 @@
+import importlib
+from civsSimulator import Tribes
+
+
+class Registry:
+    """This class represents a registry of the functions that can be used in the configuration of the tribes.
+
+    The functions are referenced in the configuration with dotted names, like **Events.migrate**, where the first part
+    is the name of a registered module and the second the name of a function in that module. Functions can also be
+    registered directly with their full name.
+
+    The names are resolved once with :func:`resolve` or :func:`compile`, so unknown functions are detected when the
+    configuration is loaded.
+    """
+    def __init__(self):
+        self._modules = {}
+        self._functions = {}
+
+    def register_module(self, name, module):
+        """
+        Registers a module of functions.
+
+        :param name: The name used in the configuration to reference the module.
+        :param module: The module, or the import path of the module. Import paths are imported the first time a
+                       function of the module is resolved.
+        """
+        self._modules[name] = module
+
+    def register(self, name, function):
+        """
+        Registers a function.
+
+        :param name: The dotted name used in the configuration to reference the function.
+        :param function: The function.
+        :raises: ValueError if the function is not callable.
+        """
+        if not callable(function):
+            raise ValueError("The function registered as {} is not callable.".format(name))
+        self._functions[name] = function
+
+    def has(self, name):
+        """
+        True if the given name can be resolved, False otherwise.
+
+        :param name: The dotted name of the function.
+        """
+        try:
+            self.resolve(name)
+        except ValueError:
+            return False
+        return True
+
+    def resolve(self, name):
+        """
+        Returns the function referenced by a dotted name.
+
+        :param name: The dotted name of the function.
+        :return: The function.
+        :raises: ValueError if the name does not reference a registered callable.
+        """
+        if name in self._functions:
+            return self._functions[name]
+        module_name, _, function_name = name.rpartition('.')
+        if module_name not in self._modules:
+            raise ValueError("Unknown module {} for function {}. Register it with register_module.".format(
+                module_name, name))
+        module = self._modules[module_name]
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+            self._modules[module_name] = module
+        function = getattr(module, function_name, None)
+        if not callable(function):
+            raise ValueError("Unknown function {}.".format(name))
+        self._functions[name] = function
+        return function
+
+    def compile(self, events):
+        """
+        Resolves a list of events of the configuration.
+
+        :param events: A list with the events, every event is a list with the dotted name of the function and the
+                       verbose flag.
+        :return: A tuple with a (function, verbose) tuple for every event.
+        :raises: ValueError if an event is not valid.
+        """
+        pipeline = []
+        for event in events:
+            if len(event) != 2 or not isinstance(event[1], bool):
+                raise ValueError("Invalid event {}, it must be a list with a name and a verbose flag.".format(event))
+            pipeline.append((self.resolve(event[0]), event[1]))
+        return tuple(pipeline)
+
+
+default = Registry()
+default.register_module("Events", "civsSimulator.Events")
+default.register_module("GlobalEvents", "civsSimulator.GlobalEvents")
+for _tribe in Tribes.__all__:
+    default.register_module(_tribe, "civsSimulator.Tribes." + _tribe)
+
+
+def register_module(name, module):
+    """
+    Registers a module of functions in the default registry, see :func:`Registry.register_module`.
+    """
+    default.register_module(name, module)
+
+
+def register(name, function):
+    """
+    Registers a function in the default registry, see :func:`Registry.register`.
+    """
+    default.register(name, function)
+
+
+def resolve(name):
+    """
+    Resolves a dotted name with the default registry, see :func:`Registry.resolve`.
+    """
+    return default.resolve(name)
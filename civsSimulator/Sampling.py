@@ -0,0 +1,138 @@
+import hashlib
+import random
+import numpy
+
+
+class Sampler:
+    """This class represents a sampling engine for the cohorts of the groups.
+
+    Splitting a cohort of *n* persons where each person falls in the first part with probability *p* is the same as
+    drawing a single binomial variate, so the cost of a split does not depend on the size of the cohort.
+
+    :param seed: The seed used to initialize the random state. If None the state is seeded from the system.
+    """
+    def __init__(self, seed=None):
+        self._random = numpy.random.RandomState(seed)
+
+    def seed(self, seed):
+        """
+        Seeds the random state of the sampler.
+
+        :param seed: The new seed.
+        """
+        self._random.seed(seed)
+
+    def get_state(self):
+        """
+        The current random state of the sampler.
+        """
+        return self._random.get_state()
+
+    def set_state(self, state):
+        """
+        Restores a random state previously returned by :func:`get_state`.
+        """
+        self._random.set_state(state)
+
+    def uniform(self, size=None):
+        """
+        Draws uniform values in the range [0, 1).
+
+        :param size: The number of values to draw. If None a single value is returned.
+        """
+        return self._random.random_sample(size)
+
+    def randrange(self, start, stop):
+        """
+        Draws an integer in the range [start, stop).
+
+        :param start: The first value of the range.
+        :param stop: The value after the last one of the range.
+        """
+        return int(self._random.randint(start, stop))
+
+    def choice(self, values, size=None, replace=True):
+        """
+        Draws random values from an array.
+
+        :param values: The array, or an int n to draw from range(n).
+        :param size: The number of values to draw. If None a single value is returned.
+        :param replace: If False the same value is not drawn twice.
+        """
+        return self._random.choice(values, size, replace)
+
+    def split(self, times, factor):
+        """
+        Splits a cohort in two parts.
+
+        :param times: The number of persons of the cohort.
+        :param factor: The probability of a person to fall in the first part.
+        :return: A list with the persons in the first part and the persons in the second part.
+        """
+        times = max(int(times), 0)
+        first = int(self._random.binomial(times, min(max(factor, 0.0), 1.0)))
+        return [first, times - first]
+
+    def split_many(self, times, factors):
+        """
+        Splits many cohorts at once.
+
+        :param times: An array with the number of persons of every cohort.
+        :param factors: An array (or a single value) with the probability of a person to fall in the first part.
+        :return: Two arrays with the persons in the first and in the second part of every cohort.
+        """
+        times = numpy.maximum(numpy.asarray(times, dtype=numpy.int64), 0)
+        factors = numpy.clip(factors, 0.0, 1.0)
+        first = self._random.binomial(times, factors).astype(numpy.int64)
+        return first, times - first
+
+
+default = Sampler()
+
+
+def derive(seed, *key):
+    """
+    Derives the seed of an independent random stream from a master seed.
+
+    The derived seed only depends on the master seed and the key, so a stream, like the one of a group, draws the same
+    values no matter how many other streams exist or in which order they are used.
+
+    :param seed: The master seed.
+    :param key: The values that identify the stream, like ('group', 3).
+    :return: An array of 32 bits words to seed a :class:`Sampler`.
+    """
+    digest = hashlib.sha256(repr((seed,) + key).encode('utf-8')).digest()
+    return numpy.frombuffer(digest, dtype='<u4')
+
+
+def stream(seed, *key):
+    """
+    Creates the sampler of an independent random stream, see :func:`derive`.
+
+    :param seed: The master seed.
+    :param key: The values that identify the stream.
+    :return: A new :class:`Sampler`.
+    """
+    return Sampler(derive(seed, *key))
+
+
+def python_stream(seed, *key):
+    """
+    Creates an independent random stream with the API of the random module, see :func:`derive`.
+
+    It is used by the code that draws from the random module, like the name generators.
+
+    :param seed: The master seed.
+    :param key: The values that identify the stream.
+    :return: A new :class:`random.Random`.
+    """
+    return random.Random(int.from_bytes(derive(seed, *key).tobytes(), 'little'))
+
+
+def seed(value):
+    """
+    Seeds the default sampler used by :func:`Utils.rsplit`.
+
+    :param value: The new seed.
+    """
+    default.seed(value)
@@ -0,0 +1,93 @@
+import numpy
+
+
+class TradeGraph:
+    """This class represents the neighbours every group can trade with in a turn.
+
+    The groups are bucketed in a grid whose cells are as wide as the largest trade radius, so the neighbours of a
+    group are found in the 3x3 buckets around it instead of scanning the map. The neighbours of a group are the groups
+    in the square of its trade radius around it, except the ones in its same cell, sorted by id, and they are kept the
+    rest of the turn.
+
+    The grid is built the first time the neighbours of a group are needed in the turn, by a sedentary group that can
+    develop trade or by a trading group, so the turns without them do not build it. The positions are the ones when
+    the grid is built. The trades are accumulated with :func:`trade` and applied to the wealth of the groups at once
+    with :func:`apply`.
+
+    :param groups: The living groups.
+    :param population: The :class:`Population.Population` that stores the groups, if the game is vectorized.
+    """
+    def __init__(self, groups, population=None):
+        self._population = population
+        self._living = groups
+        self._buckets = None
+        self._neighbours = {}
+        self._groups = {}
+        self._wealth = {}
+
+    def neighbours(self, group):
+        """
+        The groups a group can trade with.
+
+        :param group: The group.
+        :return: A list with the neighbours sorted by id.
+        """
+        if self._buckets is None:
+            self._build()
+        if group.id not in self._neighbours:
+            x, y = self._positions.get(group.id, group.position)
+            radius = group.trade_radius
+            bx = x // self._size
+            by = y // self._size
+            found = []
+            for cx in range(bx - 1, bx + 2):
+                for cy in range(by - 1, by + 2):
+                    for ox, oy, other in self._buckets.get((cx, cy), ()):
+                        if abs(ox - x) <= radius and abs(oy - y) <= radius and (ox != x or oy != y):
+                            found.append(other)
+            found.sort(key=lambda g: g.id)
+            self._neighbours[group.id] = found
+        return self._neighbours[group.id]
+
+    def _build(self):
+        self._size = max([g.trade_radius for g in self._living] + [1])
+        self._positions = {}
+        self._buckets = {}
+        for g in self._living:
+            x, y = g.position
+            self._positions[g.id] = (x, y)
+            key = (x // self._size, y // self._size)
+            if key not in self._buckets:
+                self._buckets[key] = []
+            self._buckets[key].append((x, y, g))
+
+    def _add_wealth(self, group, value):
+        self._groups[group.id] = group
+        self._wealth[group.id] = self._wealth.get(group.id, 0) + value
+
+    def trade(self, group, neighbours):
+        """
+        Records the trades of a group with its neighbours, see :func:`Group.Group.trade`.
+
+        Every side of a trade earns 5 of wealth if the prosperity of the other side is higher, and 1 otherwise.
+
+        :param group: The group.
+        :param neighbours: The groups it trades with.
+        """
+        for n in neighbours:
+            self._add_wealth(n, 5 if group.prosperity > n.prosperity else 1)
+            self._add_wealth(group, 5 if n.prosperity > group.prosperity else 1)
+
+    def apply(self):
+        """
+        Adds the wealth earned in the trades of the turn to the groups.
+        """
+        if not self._wealth:
+            return
+        if self._population is not None:
+            rows = numpy.array([self._groups[i]._index for i in self._wealth], dtype=numpy.int64)
+            self._population.wealth[rows] += numpy.array(list(self._wealth.values()))
+        else:
+            for i, value in self._wealth.items():
+                self._groups[i]._wealth += value
+        self._wealth = {}
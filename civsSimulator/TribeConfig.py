@@ -0,0 +1,54 @@
+import copy
+import random
+from civsSimulator import Utils, Registry
+
+
+class TribeConfig:
+    """This class represents the configuration of a tribe shared by all its groups.
+
+    The tribe parameters are merged with the default ones once, and frozen, so the groups can reference them instead
+    of copying them. The events and the name functions of the tribe are resolved with the registry. **Name** is the
+    function that generates a name, like **Human.get_name**, and the optional **Names** is a function that generates
+    many names at once, like **Human.get_names**. Without **Names** the names are generated one by one.
+
+    :attr:`prosperity` has the prosperity raster of every activity of the tribe in the world of its game, set by the
+    :class:`Game.Game`, so the games that share a world do not share the prosperity of their tribes.
+
+    :param tribe: A dictionary containing all the custom parameters for the tribe.
+    :param default: A dictionary containing all the default parameters for all the tribes.
+    :param registry: The :class:`Registry.Registry` used to resolve the functions. If None the default registry is
+                     used.
+    :raises: ValueError if the configuration references an unknown event or name function.
+    """
+    def __init__(self, tribe, default, registry=None):
+        registry = registry or Registry.default
+        merged = Utils.update(copy.deepcopy(tribe), copy.deepcopy(default))
+        self._config = Utils.freeze(merged)
+        self.type = merged["Type"]
+        self.events = registry.compile(merged["Events"])
+        self.name_function = registry.resolve(merged["Name"])
+        self.names_function = None
+        if "Names" in merged:
+            self.names_function = registry.resolve(merged["Names"])
+        self.prosperity = {}
+
+    def names(self, n, random=random):
+        """
+        Generates names for new groups of the tribe.
+
+        :param n: The number of names.
+        :param random: The :class:`random.Random` the names are drawn from. By default the random module.
+        :return: A list with the names.
+        """
+        if self.names_function is not None:
+            return self.names_function(self["Name-rules"], n, random)
+        return [self.name_function(self["Name-rules"], random) for _ in range(n)]
+
+    def __getitem__(self, key):
+        return self._config[key]
+
+    def __contains__(self, key):
+        return key in self._config
+
+    def get(self, key, default=None):
+        return self._config.get(key, default)
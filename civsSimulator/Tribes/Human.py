@@ -1,10 +1,18 @@
-from civsSimulator.Generator import NameGenerator
+from civsSimulator.Generator import get_generator
 import random
 
 
-def get_name(name_rules):
+def get_name(name_rules, random=random):
     try:
-        n = NameGenerator(name_rules["vowels"], name_rules["consonants"], name_rules["syllables"])
-        return n.compose(random.randint(1, name_rules["max-syllables"]))
-    except AssertionError as err:
+        n = get_generator(name_rules["vowels"], name_rules["consonants"], name_rules["syllables"])
+        return n.compose(random.randint(1, name_rules["max-syllables"]), random)
+    except AssertionError:
         return "Human-non-generated-name"
+
+
+def get_names(name_rules, n, random=random):
+    try:
+        g = get_generator(name_rules["vowels"], name_rules["consonants"], name_rules["syllables"])
+        return g.compose_many(n, name_rules["max-syllables"], random=random)
+    except AssertionError:
+        return [get_name(name_rules, random) for _ in range(n)]
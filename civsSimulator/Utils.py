@@ -1,5 +1,6 @@
-import random
-import collections
+import hashlib
+import collections.abc
+import types
 from collections import namedtuple
 
 
@@ -14,19 +15,19 @@ def opposite(value):
     return 1.0 - value
 
 
-def rsplit(times, factor):
-    ret = [0, 0]
-    for n in range(int(times)):
-        if random.random() < factor:
-            ret[0] += 1
-        else:
-            ret[1] += 1
-    return ret
+def _default_sampler():
+    # Sampling needs numpy, so it is only imported when a function is called without a sampler.
+    from civsSimulator import Sampling
+    return Sampling.default
+
+
+def rsplit(times, factor, sampler=None):
+    return (sampler or _default_sampler()).split(times, factor)
 
 
 def update(d, u):
     for k, v in u.items():
-        if isinstance(v, collections.Mapping):
+        if isinstance(v, collections.abc.Mapping):
             r = update(d.get(k, {}), v)
             d[k] = r
         else:
@@ -37,22 +38,38 @@ def update(d, u):
     return d
 
 
-def perturbate(n, pert_factor):
-    perturbation = (random.random() - 0.5) * pert_factor
+def freeze(value):
+    if isinstance(value, collections.abc.Mapping):
+        return types.MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def perturbate(n, pert_factor, sampler=None):
+    perturbation = ((sampler or _default_sampler()).uniform() - 0.5) * pert_factor
     return saturate(n + perturbation, 1.0)
 
 
-def perturbate_high(n):
-    return perturbate(n, 1.0)
+def perturbate_high(n, sampler=None):
+    return perturbate(n, 1.0, sampler)
 
 
-def perturbate_med(n):
-    return perturbate(n, 0.33)
+def perturbate_med(n, sampler=None):
+    return perturbate(n, 0.33, sampler)
 
 
-def perturbate_low(n):
-    return perturbate(n, 0.2)
+def perturbate_low(n, sampler=None):
+    return perturbate(n, 0.2, sampler)
 
 
 def add_list(l1, l2):
     return tuple([i1 + i2 for i1, i2 in zip(l1, l2)])
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
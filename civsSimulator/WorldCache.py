@@ -0,0 +1,100 @@
+import json
+import os
+import numpy
+from civsSimulator import Utils, Worlds
+from civsSimulator.Map import Map
+
+VERSION = 1
+
+
+def directory():
+    """
+    The directory of the cache, the **CIVSSIMULATOR_CACHE** environment variable or ~/.cache/civsSimulator.
+    """
+    return os.environ.get("CIVSSIMULATOR_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "civsSimulator")
+
+
+def _paths(folder, key):
+    base = os.path.join(folder, key)
+    return base + ".json", base + ".biome.npy", base + ".land.npy"
+
+
+def _write(path, write):
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary, 'wb') as f:
+        write(f)
+    os.replace(temporary, path)
+
+
+def store(folder, key, world):
+    """
+    Extracts the biome layer and the land mask of a world into the cache.
+
+    :param folder: The directory of the cache.
+    :param key: The key of the world, the hash of its file.
+    :param world: A world with a **width**, a **height** and a **biome_at** function.
+    :return: A :class:`Worlds.ArrayWorld` with the extracted arrays.
+    """
+    biomes, index = Map._load_biomes(world)
+    index = index.astype(numpy.uint8 if len(biomes) <= 256 else numpy.int32)
+    if "ocean" in biomes:
+        land = index != biomes.index("ocean")
+    else:
+        land = numpy.ones(index.shape, dtype=bool)
+    meta_path, biome_path, land_path = _paths(folder, key)
+    os.makedirs(folder, exist_ok=True)
+    _write(biome_path, lambda f: numpy.save(f, index))
+    _write(land_path, lambda f: numpy.save(f, land))
+    meta = {'version': VERSION, 'width': int(world.width), 'height': int(world.height), 'biomes': biomes}
+    _write(meta_path, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+    return Worlds.ArrayWorld(index, biomes, land, compact=False)
+
+
+def lookup(folder, key):
+    """
+    Maps the arrays of a cached world.
+
+    :param folder: The directory of the cache.
+    :param key: The key of the world.
+    :return: A :class:`Worlds.ArrayWorld` whose arrays are read only memory maps of the cache files, or None if the
+             world is not in the cache.
+    """
+    meta_path, biome_path, land_path = _paths(folder, key)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') != VERSION:
+            return None
+        index = numpy.load(biome_path, mmap_mode='r')
+        land = numpy.load(land_path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if index.shape != (meta['height'], meta['width']) or land.shape != index.shape:
+        return None
+    return Worlds.ArrayWorld(index, meta['biomes'], land, compact=False)
+
+
+def load(path, opener, folder=None):
+    """
+    Opens the file of a world through the cache.
+
+    The first time a file is opened it is read with the opener and its biomes and land mask are stored in the cache,
+    keyed by the hash of its content. Later the cached arrays are memory mapped, so the world file is not decoded
+    again and all the processes that open it share the same pages. If the cache can not be written the world is opened
+    without it.
+
+    :param path: The world file.
+    :param opener: A function that reads the file and returns a world, like **World.open_protobuf**.
+    :param folder: The directory of the cache. If None :func:`directory` is used.
+    :return: A :class:`Worlds.ArrayWorld`, or the world returned by the opener if it could not be cached.
+    """
+    folder = folder or directory()
+    key = Utils.file_hash(path)
+    world = lookup(folder, key)
+    if world is not None:
+        return world
+    world = opener(path)
+    try:
+        return store(folder, key, world)
+    except OSError:
+        return world
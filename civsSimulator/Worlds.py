@@ -0,0 +1,198 @@
+import numpy
+
+BIOME_COLORS = {
+    'ocean': (23, 94, 145),
+    'ice': (255, 255, 255),
+    'subpolar dry tundra': (128, 128, 128),
+    'subpolar moist tundra': (96, 128, 128),
+    'subpolar wet tundra': (64, 128, 128),
+    'subpolar rain tundra': (32, 128, 192),
+    'polar desert': (192, 192, 192),
+    'boreal desert': (160, 160, 128),
+    'cool temperate desert': (192, 192, 128),
+    'warm temperate desert': (224, 224, 128),
+    'subtropical desert': (240, 240, 128),
+    'tropical desert': (255, 255, 128),
+    'boreal rain forest': (32, 160, 192),
+    'cool temperate rain forest': (32, 192, 192),
+    'warm temperate rain forest': (32, 224, 192),
+    'subtropical rain forest': (32, 240, 176),
+    'tropical rain forest': (32, 255, 160),
+    'boreal wet forest': (64, 160, 144),
+    'cool temperate wet forest': (64, 192, 144),
+    'warm temperate wet forest': (64, 224, 144),
+    'subtropical wet forest': (64, 240, 144),
+    'tropical wet forest': (64, 255, 144),
+    'boreal moist forest': (96, 160, 128),
+    'cool temperate moist forest': (96, 192, 128),
+    'warm temperate moist forest': (96, 224, 128),
+    'subtropical moist forest': (96, 240, 128),
+    'tropical moist forest': (96, 255, 128),
+    'warm temperate dry forest': (128, 224, 128),
+    'subtropical dry forest': (128, 240, 128),
+    'tropical dry forest': (128, 255, 128),
+    'boreal dry scrub': (128, 160, 128),
+    'cool temperate desert scrub': (160, 192, 128),
+    'warm temperate desert scrub': (192, 224, 128),
+    'subtropical desert scrub': (208, 240, 128),
+    'tropical desert scrub': (224, 255, 128),
+    'cool temperate steppe': (128, 192, 128),
+    'warm temperate thorn scrub': (160, 224, 128),
+    'subtropical thorn woodland': (176, 240, 128),
+    'tropical thorn woodland': (192, 255, 128),
+    'tropical very dry forest': (160, 255, 128),
+}
+
+# The biomes of every temperature belt, from the coldest to the hottest, sorted from the driest to the wettest.
+BELTS = [
+    ['polar desert', 'ice'],
+    ['subpolar dry tundra', 'subpolar moist tundra', 'subpolar wet tundra', 'subpolar rain tundra'],
+    ['boreal desert', 'boreal dry scrub', 'boreal moist forest', 'boreal wet forest', 'boreal rain forest'],
+    ['cool temperate desert', 'cool temperate desert scrub', 'cool temperate steppe', 'cool temperate moist forest',
+     'cool temperate wet forest', 'cool temperate rain forest'],
+    ['warm temperate desert', 'warm temperate desert scrub', 'warm temperate thorn scrub', 'warm temperate dry forest',
+     'warm temperate moist forest', 'warm temperate wet forest', 'warm temperate rain forest'],
+    ['subtropical desert', 'subtropical desert scrub', 'subtropical thorn woodland', 'subtropical dry forest',
+     'subtropical moist forest', 'subtropical wet forest', 'subtropical rain forest'],
+    ['tropical desert', 'tropical desert scrub', 'tropical thorn woodland', 'tropical very dry forest',
+     'tropical dry forest', 'tropical moist forest', 'tropical wet forest', 'tropical rain forest'],
+]
+
+
+class Biome:
+    """This class represents the biome of a cell, as returned by :func:`ArrayWorld.biome_at`.
+
+    :param name: The name of the biome.
+    """
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class ArrayWorld:
+    """This class represents a world stored in memory as an array of biomes.
+
+    Any object with a **width**, a **height** and a **biome_at** function returning an object with a **name** function
+    can be simulated, like a WorldEngine world. This world also has the :attr:`biomes` names and the
+    :attr:`biome_index` array, so :class:`Map.Map` takes them as they are instead of reading the biome of every cell.
+
+    :param biome_index: An array indexed as [y, x] with the index of the biome of every cell in **biomes**.
+    :param biomes: The names of the biomes.
+    :param land: An optional array indexed as [y, x], True for the cells that are not ocean.
+    :param compact: If True the biomes without cells are removed, otherwise the array is used as it is, without
+                    copying it, like the memory mapped arrays of the :mod:`WorldCache`.
+    :raises: ValueError if the array is not two dimensional or has indices out of the biomes.
+    """
+    def __init__(self, biome_index, biomes, land=None, compact=True):
+        biome_index = numpy.asarray(biome_index)
+        if biome_index.ndim != 2:
+            raise ValueError("The biomes of a world must be a two dimensional array.")
+        self.land = land
+        if not compact:
+            self.biomes = list(biomes)
+            self.biome_index = biome_index
+            self.height, self.width = biome_index.shape
+            return
+        counts = numpy.bincount(biome_index.ravel(), minlength=len(biomes))
+        if len(counts) > len(biomes):
+            raise ValueError("The world has cells with a biome out of the {} given biomes.".format(len(biomes)))
+        used = numpy.flatnonzero(counts)
+        remap = numpy.zeros(len(biomes), dtype=numpy.int32)
+        remap[used] = numpy.arange(len(used), dtype=numpy.int32)
+        self.biomes = [biomes[i] for i in used]
+        self.biome_index = remap[biome_index]
+        self.height, self.width = self.biome_index.shape
+
+    @classmethod
+    def from_names(cls, names):
+        """
+        Creates a world from an array with the name of the biome of every cell.
+
+        :param names: An array indexed as [y, x].
+        :return: The new world.
+        """
+        biomes, index = numpy.unique(numpy.asarray(names).astype(str), return_inverse=True)
+        return cls(index.reshape(numpy.shape(names)), [str(b) for b in biomes])
+
+    def biome_at(self, pos):
+        """
+        The biome at the given position.
+        """
+        return Biome(self.biomes[self.biome_index[pos[1], pos[0]]])
+
+
+def from_image(path, colors=None):
+    """
+    Creates a world from a biome image, like the ones exported by WorldEngine.
+
+    :param path: The .png file.
+    :param colors: A dictionary with the (red, green, blue) color of every biome. If None :data:`BIOME_COLORS` is used.
+    :return: A :class:`ArrayWorld`.
+    :raises: ValueError if the image has a color that is not a biome.
+    """
+    import png
+    colors = colors or BIOME_COLORS
+    width, height, rows, info = png.Reader(filename=path).asRGBA8()
+    pixels = numpy.vstack([numpy.asarray(row, dtype=numpy.uint32) for row in rows]).reshape(height, width, 4)
+    packed = (pixels[:, :, 0] << 16) | (pixels[:, :, 1] << 8) | pixels[:, :, 2]
+    biomes = sorted(colors)
+    keys = numpy.array([(colors[b][0] << 16) | (colors[b][1] << 8) | colors[b][2] for b in biomes], dtype=numpy.uint32)
+    order = numpy.argsort(keys)
+    found = numpy.clip(numpy.searchsorted(keys[order], packed), 0, len(keys) - 1)
+    if not (keys[order][found] == packed).all():
+        raise ValueError("The image {} has colors that are not biomes.".format(path))
+    return ArrayWorld(order[found], biomes)
+
+
+def _noise(random, width, height, cells):
+    coarse = random.random_sample((cells + 1, cells + 1)).astype(numpy.float32)
+    x = numpy.linspace(0, cells, width, endpoint=False)
+    y = numpy.linspace(0, cells, height, endpoint=False)
+    xi = x.astype(numpy.int64)
+    yi = y.astype(numpy.int64)
+    fx = (x - xi).astype(numpy.float32)
+    fy = (y - yi).astype(numpy.float32)[:, None]
+    rows = coarse[:, xi] * (1 - fx) + coarse[:, xi + 1] * fx
+    return rows[yi] * (1 - fy) + rows[yi + 1] * fy
+
+
+def generate(width, height, seed=None, land=0.4, detail=8):
+    """
+    Generates a world procedurally.
+
+    The elevation, the temperature and the humidity are sums of smoothed noise. The cells below the sea level are
+    ocean, the temperature picks a belt of :data:`BELTS` colder to the poles, and the humidity picks a biome of the
+    belt.
+
+    :param width: The width of the world.
+    :param height: The height of the world.
+    :param seed: The seed of the noise. If None a random one is used.
+    :param land: The fraction of the cells that are land.
+    :param detail: The number of noise cells along the shortest side of the world for the coarsest octave.
+    :return: A :class:`ArrayWorld`.
+    """
+    random = numpy.random.RandomState(seed)
+    cells = max(detail * max(width, height) // min(width, height), 1)
+
+    def field():
+        return 0.6 * _noise(random, width, height, cells) + 0.4 * _noise(random, width, height, 4 * cells)
+
+    elevation = field()
+    latitude = numpy.abs(numpy.linspace(-1.0, 1.0, height))[:, None]
+    temperature = numpy.clip(1.0 - latitude + 0.3 * (field() - 0.5) - 0.3 * elevation, 0.0, 0.999)
+    humidity = numpy.clip(field() * 1.4 - 0.2, 0.0, 0.999)
+    sample = elevation[::max(height // 512, 1), ::max(width // 512, 1)]
+    sea_level = numpy.percentile(sample, 100 * (1.0 - land))
+
+    biomes = ['ocean'] + [b for belt in BELTS for b in belt]
+    table = numpy.zeros((len(BELTS), 16), dtype=numpy.int32)
+    first = 1
+    for i, belt in enumerate(BELTS):
+        table[i] = first + (numpy.arange(16) * len(belt)) // 16
+        first += len(belt)
+    belt = (temperature * len(BELTS)).astype(numpy.int64)
+    index = table[belt, (humidity * 16).astype(numpy.int64)]
+    index[elevation < sea_level] = 0
+    return ArrayWorld(index, biomes)
@@ -1,52 +1,140 @@
-from civsSimulator.Game import Game
 import argparse
 import json
+import sys
+
+# The modules of the simulation import numpy, so they are imported by the commands after the arguments are parsed,
+# and the help, the configuration check and the fact summaries start without them.
+
+
+def ensemble(args):
+    parser = argparse.ArgumentParser(prog="civsSimulator ensemble")
+    parser.add_argument('world', help='.world file, or .png biome image, where the groups will be simulated.')
+    parser.add_argument('config', help='.json with the configuration of the tribes.')
+    parser.add_argument('--runs', help='The number of simulations to run.', default=100, type=int)
+    parser.add_argument('--workers', help='The number of processes. By default the number of CPUs.', type=int)
+    parser.add_argument('--seed', help='The seed of the first simulation.', default=0, type=int)
+    parser.add_argument('--groups', help='The number of groups that will be created to simulate.', default=20, type=int)
+    parser.add_argument('--turn', help='The number of turns the simulation will run.', default=50, type=int)
+    parser.add_argument('--vectorized', help='Updates the population of all the groups at once.',
+                        action='store_true')
+    parser.add_argument('-o', '--output', help='File to save the summary of every simulation.',
+                        default="ensemble.txt")
+    opt = parser.parse_args(args)
+    from civsSimulator import Ensemble
+    summaries = []
+    with open(opt.output, 'w') as f:
+        for summary in Ensemble.run(opt.config, opt.world, opt.runs, opt.groups + 1, opt.turn + 1, opt.seed,
+                                    opt.workers, opt.vectorized):
+            summaries.append(summary)
+            f.write(json.dumps(summary) + '\n')
+            f.flush()
+    print(json.dumps(Ensemble.aggregate(summaries), indent=2))
+
+
+def check(args):
+    parser = argparse.ArgumentParser(prog="civsSimulator check")
+    parser.add_argument('config', help='.json with the configuration of the tribes.')
+    opt = parser.parse_args(args)
+    from civsSimulator.TribeConfig import TribeConfig
+    from civsSimulator import Registry
+    try:
+        with open(opt.config) as data_file:
+            config = json.load(data_file)
+        general = config["Tribe"]["General"]
+        tribes = [TribeConfig(tribe, general) for tribe in config["Tribe"]["Tribes"]]
+        Registry.default.compile(general["Global-events"])
+    except (OSError, ValueError, KeyError) as err:
+        print("{} is not valid: {}".format(opt.config, err))
+        sys.exit(1)
+    print("{} is valid, with the tribes {}".format(opt.config, ", ".join(t.type for t in tribes)))
+
+
+def _read_facts(path):
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+    if magic == b'CIVSFACT':
+        from civsSimulator import FactLog
+        log = FactLog.read(path)
+        names = {FactLog.POSITION: 'pos', FactLog.NOMADISM: 'nomadism', FactLog.AGRICULTURE: 'agricult',
+                 FactLog.DEAD: 'dead'}
+        return [(int(turn), int(group), names[int(event)])
+                for turn, group, event in zip(log.turn.tolist(), log.group.tolist(), log.event.tolist())]
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        turns = enumerate(json.loads(text))
+    else:
+        turns = ((line['turn'], line['facts']) for line in map(json.loads, text.splitlines()) if line)
+    return [(turn, f['id'], key) for turn, facts in turns for f in facts or [] for key in f['fact']]
+
+
+def facts(args):
+    parser = argparse.ArgumentParser(prog="civsSimulator facts")
+    parser.add_argument('facts', help='The facts file written by a simulation, as JSON, NDJSON or binary fact log.')
+    opt = parser.parse_args(args)
+    records = _read_facts(opt.facts)
+    counts = {}
+    for turn, group, key in records:
+        counts[key] = counts.get(key, 0) + 1
+    print(json.dumps({'turns': max([r[0] for r in records], default=0), 'groups': len({r[1] for r in records}),
+                      'facts': counts}, indent=2, sort_keys=True))
+
+
+COMMANDS = {'ensemble': ensemble, 'check': check, 'facts': facts}
 
 
 def main():
+    if sys.argv[1:2] and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
 
-    parser = argparse.ArgumentParser(prog="civsSimulator")
-    parser.add_argument('world', help='.world file where the groups will be simulated.')
+    parser = argparse.ArgumentParser(prog="civsSimulator", epilog="Use 'civsSimulator ensemble -h' to run many "
+                                                                  "seeded simulations in parallel, 'civsSimulator "
+                                                                  "check' to validate a configuration and "
+                                                                  "'civsSimulator facts' to summarize a facts file.")
+    parser.add_argument('world', help='.world file, or .png biome image, where the groups will be simulated.')
     parser.add_argument('config', help='.json with the configuration of the tribes.')
     parser.add_argument('--groups', help='The number of groups that will be created to simulate.', default=20, type=int)
     parser.add_argument('--turn', help='The number of turns the simulation will run.', default=50, type=int)
     parser.add_argument('--verbose', '-v', help='Prints the facts that happen.', nargs='?', default=False,
                         const=True, type=bool)
     parser.add_argument('-o', '--output', help='File to save the facts.', default="facts.txt")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--stream', help='Writes the facts of every turn to the output as a line of JSON when '
+                                                'the turn ends.', action='store_true')
+    output_format.add_argument('--binary', help='Writes the facts of every turn to the output as a binary fact log.',
+                               action='store_true')
+    parser.add_argument('--vectorized', help='Updates the population of all the groups at once.',
+                        action='store_true')
+    parser.add_argument('--seed', help='The seed of the simulation. By default a random one.', type=int)
+    parser.add_argument('--profile', help='Prints the calls, triggers and time of every event and phase of the turns.',
+                        action='store_true')
+    parser.add_argument('--profile-turns', help='File to save the time of every event and phase in every turn, as a '
+                                                'line of JSON per turn. Implies --profile.')
     opt = parser.parse_args()
-    g = Game(opt.config, opt.world)
-    for i in range(opt.groups + 1):
-        g.create_group()
-
-    for i in range(opt.turn + 1):
-        g.turn()
-        facts = []
-        for x in g.groups:
-            if i in x.facts:
-                facts.extend(x.facts[i])
-        if opt.verbose:
-            if facts:
-                print("========================================")
-                print("=========      In turn {}      =========".format(i))
-                print("========================================")
-                for x in facts:
-                    print(x)
-    dead = 0
-    for x in g.groups:
-        if x.is_dead:
-            dead += 1
-    print("\nAt the end {} groups have perished in history".format(dead))
-    f = open(opt.output, 'w')
-    saveFacts = [{} for i in range(opt.turn + 1)]
-    for i in range(opt.turn + 1):
-        facts = []
-        for x in g.groups:
-            if i in x.file_facts:
-                facts.extend([{'id': x.id, 'name': x.name, 'fact': x.file_facts[i]}])
-        if facts:
-            saveFacts[i] = facts
-    json.dump(saveFacts, f)
-    f.close()
+    from civsSimulator.Game import Game
+    from civsSimulator import Output
+    g = Game(opt.config, opt.world, opt.vectorized, seed=opt.seed)
+    if opt.profile or opt.profile_turns:
+        g.profile()
+    if opt.binary:
+        from civsSimulator import FactLog
+        writer = FactLog.FactLogWriter(opt.output)
+    elif opt.stream:
+        writer = Output.NDJSONWriter(opt.output)
+    else:
+        writer = Output.JSONWriter(opt.output)
+    with Output.BackgroundWriter(writer, opt.verbose) as output:
+        g.subscribe(output)
+        g.create_groups(opt.groups + 1)
+
+        for i in range(opt.turn + 1):
+            g.turn()
+    print("\nAt the end {} groups have perished in history".format(len(g.dead)))
+    if g.profiler is not None:
+        print()
+        g.profiler.print_summary()
+        if opt.profile_turns:
+            g.profiler.dump(opt.profile_turns)
 
 if __name__ == "__main__":
     main()